@@ -70,98 +70,295 @@ if drop >= 0.3:
     log.log_event(ticker="ACME", event_type="BIOTECH_DROP", value=drop, notes="Phase 2 failed")
 '''
 
+import atexit
 import json
+import queue
+import threading
 from datetime import datetime
 import time
 import os
 import sys
 
+from core.serialization import dumps_json, iso_utc
+
+from .email_config import EMAIL_SETTINGS
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # not installed or not Linux: approval waits fall back to polling
+    INotify = None
+
 # Global: Approval authority email placeholder (may become part of access control or LDAP system)
 APPROVAL_CONTACT_EMAIL = "lp_approver@example.com"
 
+# SMTP credentials are resolved once at import (see env_check.check_env_vars), not per alert
+_SMTP_SENDER_EMAIL = os.getenv("SMTP_SENDER_EMAIL")
+_SMTP_SENDER_PASSWORD = os.getenv("SMTP_SENDER_PASSWORD")
+
+# smtplib is imported on the first SMTP connection; most runs only log and never email
+_smtplib = None
+
+# Alert emails share one fixed envelope, so the headers are encoded once and each alert
+# only appends its body. Sent as raw bytes via sendmail, skipping MIMEText construction.
+_ALERT_RECIPIENT = "Bdander2000@msn.com"
+_ALERT_HEADER = (
+    f"From: {_SMTP_SENDER_EMAIL}\r\n"
+    f"To: {_ALERT_RECIPIENT}\r\n"
+    "Subject: Compliance Alert from Trading System\r\n"
+    "MIME-Version: 1.0\r\n"
+    "Content-Type: text/plain; charset=utf-8\r\n"
+    "Content-Transfer-Encoding: 8bit\r\n"
+    "\r\n"
+).encode()
+
 # Utility function: wait_for_external_approval
 # ------------------------------------------------
 # This function halts execution until a specific JSON file confirms
 # that an external party has reviewed and approved a sensitive event.
 # Intended for manual checkpoints, audit pauses, or double-confirmation protocols.
+#
+# On Linux with inotify_simple installed, the flag's directory is watched so approval
+# is picked up as soon as the file is written; check_interval then only bounds how long
+# a missed event can go unnoticed. Otherwise the file is polled with exponential backoff
+# starting at 100 ms and capped at check_interval.
 def wait_for_external_approval(flag_filepath, check_interval=60):
     print(f"[WAIT] Awaiting external approval via: {flag_filepath}")
-    while True:
-        if os.path.exists(flag_filepath):
-            try:
-                with open(flag_filepath, 'r') as f:
-                    data = json.load(f)
-                    if data.get("approved") is True:
-                        approved_by = data.get("approved_by", "UNKNOWN")
-                        approved_when = data.get("timestamp", datetime.now().isoformat())
-                        print(f"[APPROVED] Proceeding — approved by {approved_by} at {approved_when}")
-                        return
-            except Exception as e:
-                print(f"WARNING: Could not read approval file {flag_filepath}: {e}")
-        else:
-            print(f"[WAIT] No approval file found yet: {flag_filepath}")
+    if INotify is not None and _wait_for_approval_inotify(flag_filepath, check_interval):
+        return
+
+    delay = 0.1
+    while not _approval_granted(flag_filepath):
+        time.sleep(delay)
+        delay = min(delay * 2, check_interval)
+
 
-        time.sleep(check_interval)
+def _wait_for_approval_inotify(flag_filepath, check_interval):
+    # Returns False if the watch cannot be set up, so the caller falls back to polling
+    watch_dir = os.path.dirname(os.path.abspath(flag_filepath))
+    flag_name = os.path.basename(flag_filepath)
+    try:
+        ino = INotify()
+        ino.add_watch(watch_dir, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+    except OSError as e:
+        print(f"WARNING: Could not watch {watch_dir} for approval, polling instead: {e}")
+        return False
+
+    with ino:
+        # Checked after the watch is in place so a file written in between is not missed
+        if _approval_granted(flag_filepath):
+            return True
+        while True:
+            events = ino.read(timeout=int(check_interval * 1000))
+            if (not events or any(ev.name == flag_name for ev in events)) and _approval_granted(flag_filepath):
+                return True
+
+
+def _approval_granted(flag_filepath):
+    if not os.path.exists(flag_filepath):
+        return False
+    try:
+        with open(flag_filepath, 'r') as f:
+            data = json.load(f)
+            if data.get("approved") is True:
+                approved_by = data.get("approved_by", "UNKNOWN")
+                approved_when = data.get("timestamp", datetime.now().isoformat())
+                print(f"[APPROVED] Proceeding — approved by {approved_by} at {approved_when}")
+                return True
+    except Exception as e:
+        print(f"WARNING: Could not read approval file {flag_filepath}: {e}")
+    return False
 
 
 class ComplianceLogger:
+    # Disk writes happen on a background thread so the caller only pays for an enqueue.
+    # The writer drains everything queued since its last wake-up and writes it in one call.
+    # If the queue is full, the event is written synchronously instead of being dropped.
+    QUEUE_MAXSIZE = 10000
+
+    # The SMTP session opened by notify() is reused across alerts and recycled
+    # after this many messages to stay within provider per-connection limits.
+    SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+
+    # Non-urgent alerts raised within this window are coalesced into one digest email
+    ALERT_DIGEST_DELAY_SEC = 2.0
+
     def __init__(self, log_file_path):
         # Path to the file where JSON-formatted logs will be saved
         self.log_file_path = log_file_path
         self.log_records = []  # also keep logs in memory (useful for in-process reviews)
 
+        # Single persistent handle with a 1 MiB user-space buffer, shared by the writer
+        # thread and the queue-full fallback. It is only pushed to the OS by flush()/close().
+        self._fh = open(self.log_file_path, 'ab', buffering=1 << 20)
+        self._write_lock = threading.Lock()
+        self._q = queue.Queue(maxsize=self.QUEUE_MAXSIZE)
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+        self._smtp = None
+        self._smtp_sent = 0
+        self._alert_lock = threading.Lock()  # guards the alert buffer and timer; never held over network I/O
+        self._smtp_lock = threading.Lock()   # guards the SMTP session; taken before _alert_lock, never inside it
+        self._alert_buf = []
+        self._alert_timer = None
+        atexit.register(self.close)
+
     def log_event(self, ticker, event_type, value, notes=None):
         # Create and store a structured event log with timestamp
         record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_utc(),
             "ticker": ticker,
             "event_type": event_type,
-            "value": round(value, 4),
+            "value": value.__round__(4),  # same as round(value, 4), minus the builtin lookup/dispatch
             "notes": notes or ""
         }
         self.log_records.append(record)
 
-        # Append to disk immediately to preserve in case of crash
+        line = dumps_json(record, newline=True)
         try:
-            with open(self.log_file_path, 'a') as f:
-                json.dump(record, f)
-                f.write('\n')
-        except Exception as e:
-            print(f"DANGER: Failed to write to log file {self.log_file_path}: {e}")
+            self._q.put_nowait(line)
+        except queue.Full:
+            self._write([line])
 
         return record
 
-    def notify(self, message):
+    def _writer_loop(self):
+        # Queue items are encoded log lines, or threading.Event markers posted by flush()/close()
+        while True:
+            batch = [self._q.get()]
+            try:
+                while True:
+                    batch.append(self._q.get_nowait())
+            except queue.Empty:
+                pass
+
+            lines = [item for item in batch if isinstance(item, bytes)]
+            if lines:
+                self._write(lines)
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is None:
+                    return
+
+    def _write(self, lines):
+        with self._write_lock:
+            try:
+                self._fh.write(b''.join(lines))
+            except Exception as e:
+                print(f"DANGER: Failed to write to log file {self.log_file_path}: {e}")
+
+    def flush(self, fsync=False):
+        # Block until every event logged so far has been handed to the OS.
+        # Pass fsync=True at safety checkpoints to also force it onto disk.
+        if self._writer.is_alive():
+            done = threading.Event()
+            self._q.put(done)
+            done.wait()
+        with self._write_lock:
+            if self._fh.closed:
+                return
+            try:
+                self._fh.flush()
+                if fsync:
+                    os.fsync(self._fh.fileno())
+            except Exception as e:
+                print(f"DANGER: Failed to flush log file {self.log_file_path}: {e}")
+
+    def close(self):
+        self._flush_alerts()
+        with self._smtp_lock:
+            self._close_smtp()
+        if self._fh.closed:
+            return
+        self.flush()
+        if self._writer.is_alive():
+            self._q.put(None)
+            self._writer.join()
+        self._fh.close()
+        atexit.unregister(self.close)
+
+    def notify(self, message, urgent=False):
         # Primary notification system: print + optional email alert
         print(f"[NOTIFY] {message}")
 
-        # Email alert logic — only if SMTP settings are configured
-        import smtplib
-        from email.mime.text import MIMEText
-
-        recipient = "Bdander2000@msn.com"
-        subject = "Compliance Alert from Trading System"
-        body = f"Alert generated at {datetime.now().isoformat()}:
+        # Email goes out as a digest after ALERT_DIGEST_DELAY_SEC, so a burst of alerts
+        # costs one SMTP send. Urgent alerts flush the pending digest immediately.
+        with self._alert_lock:
+            self._alert_buf.append((datetime.now().isoformat(), message))
+            if not urgent and self._alert_timer is None:
+                self._alert_timer = threading.Timer(self.ALERT_DIGEST_DELAY_SEC, self._flush_alerts)
+                self._alert_timer.daemon = True
+                self._alert_timer.start()
+        if urgent:
+            self._flush_alerts()
 
-{message}"
+    def _flush_alerts(self):
+        # The buffer is swapped out under _alert_lock and sent after releasing it, so notify()
+        # only ever waits for a list swap. Holding _smtp_lock across both keeps digests in order.
+        with self._smtp_lock:
+            with self._alert_lock:
+                if self._alert_timer is not None:
+                    self._alert_timer.cancel()
+                    self._alert_timer = None
+                alerts, self._alert_buf = self._alert_buf, []
+            if not alerts:
+                return
 
-        # Customize this to match your actual email provider (Gmail, Outlook, etc.)
-        smtp_host = "smtp.office365.com"
-        smtp_port = 587
-        import os
-        sender_email = os.getenv("SMTP_SENDER_EMAIL")  # set in environment
-        sender_password = os.getenv("SMTP_SENDER_PASSWORD")  # set in environment
+            if len(alerts) == 1:
+                generated_at, message = alerts[0]
+                body = f"Alert generated at {generated_at}:\n\n{message}"
+            else:
+                body = f"{len(alerts)} alerts generated:\n\n" + "\n".join(
+                    f"[{generated_at}] {message}" for generated_at, message in alerts)
+            self._send_alert_email(body)
 
+    def _send_alert_email(self, body):
+        # Email alert logic — only if SMTP settings are configured
+        msg = _ALERT_HEADER + body.replace('\n', '\r\n').encode()
         try:
-            msg = MIMEText(body)
-            msg['Subject'] = subject
-            msg['From'] = sender_email
-            msg['To'] = recipient
-
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                server.starttls()
-                server.login(sender_email, sender_password)
-                server.send_message(msg)
+            self._get_smtp().sendmail(_SMTP_SENDER_EMAIL, [_ALERT_RECIPIENT], msg)
+            self._smtp_sent += 1
 
         except Exception as e:
             print(f"[EMAIL ERROR] Failed to send alert email: {e}")
+            self._close_smtp()
+
+    def _get_smtp(self):
+        # Reuse the open session while it is healthy and under its message cap
+        if self._smtp is not None:
+            if self._smtp_sent >= self.SMTP_MAX_MESSAGES_PER_CONNECTION:
+                self._close_smtp()
+            else:
+                try:
+                    self._smtp.noop()
+                except Exception:
+                    self._close_smtp()
+
+        if self._smtp is None:
+            self._smtp = self._connect_smtp()
+            self._smtp_sent = 0
+        return self._smtp
+
+    def _connect_smtp(self):
+        global _smtplib
+        if _smtplib is None:
+            import smtplib as _smtplib
+
+        server = _smtplib.SMTP(EMAIL_SETTINGS["smtp_host"], EMAIL_SETTINGS["smtp_port"])
+        try:
+            server.starttls()
+            server.login(_SMTP_SENDER_EMAIL, _SMTP_SENDER_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _close_smtp(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
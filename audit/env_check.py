@@ -9,15 +9,23 @@
 import os
 
 REQUIRED_VARS = ["SMTP_SENDER_EMAIL", "SMTP_SENDER_PASSWORD"]
+_REQUIRED_VARS = frozenset(REQUIRED_VARS)
+
+# Set once all required variables have been seen, so repeat callers return immediately
+_env_ok = False
 
 def check_env_vars():
-    missing = [var for var in REQUIRED_VARS if not os.getenv(var)]
+    global _env_ok
+    if _env_ok:
+        return True
+
+    # Unset and empty variables both count as missing
+    missing = (_REQUIRED_VARS - os.environ.keys()) | {var for var in _REQUIRED_VARS if os.environ.get(var) == ""}
     if missing:
-        print("DANGER: Missing required environment variables:")
-        for var in missing:
-            print(f"  - {var}")
+        print("DANGER: Missing required environment variables:\n  - " + "\n  - ".join(sorted(missing)))
         return False
     print("NOTICE: All required environment variables are set.")
+    _env_ok = True
     return True
 
 # Example usage in a script:
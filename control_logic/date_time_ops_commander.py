@@ -1,7 +1,7 @@
-Program: date_time_ops_commander.py
-Author: Brian Anderson
-Origin Date: 10May2025
-Version: 1.1
+# Program: date_time_ops_commander.py
+# Author: Brian Anderson
+# Origin Date: 10May2025
+# Version: 1.1
 #
 # Purpose:
 #    /Establish and elucidate rules and action enabling/disabling, for different days and specific times.
@@ -11,7 +11,7 @@ Version: 1.1
 
 # NOTE: There is extensive idea development at the bottom, in the form of TODO.
 
-from date_time import datetime
+from datetime import datetime
 from exclusions.exclusions_2025 import (    #change the year as needed
     is_valid_trading_day,
     exit_time_on_fomc_day,
@@ -24,166 +24,130 @@ from exclusions.exclusions_2025 import (    #change the year as needed
     # may need a line for when any of these dont exist; e.g. there is no election in 2025
 
 
-def stock_price_division(stuff here…):
-  Stock_Price_Small = [ 
-    “Small Penny”, 0.40, 1.95;
-    “Medium Penny”, 1.96, 4.95;
-    “Large Penny”, 96, 17.95]
-  Stock_Price_Medium = [
-    “Smaller Medium”, 17.96, 37.95;
-    “Larger Medium”, 37.96, 72.49]
-  Stock_Price_Large = [
-	  “Large, 1of4”, 72.50, 149.95;
-    “Large, 2of4”, 149.96, 299.95;
-    “Large, 3of4”, 299.96, 499.95;
-    “Large, 4of4”, 499.96, 799.95]
-  Stock_Price_Huge = [
-    “Smaller Huge”, 799.96, 1499.95;
-    “Larger Huge:, 1499.96, 9995.00]
-
-
-def division_of_time_based_operation (put stuff here...) :
-  # assign the defaults:
-  stock_trading_timeperiod = str()
-  stock_trading_algo_main = (stock_trading_turned_off,0)
-  options_trading_algo = (options_trading_turned_off,0)
-  futures_trading_algo = (futures_trading_turned_off,0)
-  # I might need to tuple everything below as well, depending on what we need to do
-
-  current_time = datetime(now)
-  # convert to EST if needed
-  Wait(60)
-  While(current_time ~= previous_time) :    return current_time… advance the time
-
-  if date_today is not in (Monday, Tuesday, Wednesday, Thursday, Friday) :
-	  stock_trading_timeperiod = “Stock market asleep for the weekend… zzz...”
-    if date_today is (Sunday) and current_time > 18:00:00 :
-		  stock_trading_timeperiod() = “Market is asleep, futures awake.”
-		  stock_trading_algo_main_status() = stock_trading_turned_off
-		  options_trading_algo_status() = options_trading_turned_off
-		  futures_trading_algo_status() = futures_trading_preMonday_mode
-      return (all the above stuff)
-	
-    # Else… (if Saturday or Sunday, before 6pm on Sunday)
-	  stock_trading_timeperiod() = “Everything is asleep for now.  Chill out.”
-	  stock_trading_algo_main_status() = stock_trading_turned_off
-	  options_trading_algo_status() = options_trading_turned_off
-	  futures_trading_algo_status() = futures_trading_turned_off
-    return (all the above stuff)
-
-  #if date_today is in (Monday(),Tuesday(),Wednesday(),Thursday(),Friday())
-	if date_today is not in (excluded_dates({current_year}) :
-		if date_today is not in (excluded_times({current_year}) :
-			weekday_market_machine()
-			is_weekday_and_not_excluded_date_or_time = True
-		return is_weekday_and_not_excluded_date_or_time
-  return None
-
-# NOTE: may be able to bypass this with:
-‘’’
-from exclusions.exclusions_2024 import (    #change the year as needed
-    is_valid_trading_day,
-    exit_time_on_fomc_day,
-    exit_time_on_half_day,
-    powell_speech_blackout,
-    quad_witching_exit_time,
-    nfp_trading_restrictions,
-    election_day_halt
-‘’’
-
-
-def weekday_market_machine(current_time, previous_time, date_today) :
-	# just to triple check:
-	While (is_weekday_and_not_excluded_date_and_time == True) :
-	#indent all the rest below:
-  if current_time >= 00:00:00 and current_time < 02:00:00 :
-		market_trading_timeperiod = “Market is asleep, slow futures… zzz …”
-		stock_trading_algo_main = stock_trading_turned_off
-		options_trading_algo = options_trading_turned_off
-		futures_trading_algo = futures_trading_afterhours_gentle_mode
-	# in futures program, give ourselves some room to breathe 2 min before and after Asian futures sleepy time
-    return (all the above stuff)
-
-  if (current_time >= 02:00:00 and current_time < 04:00:00)
-		market_trading_timeperiod = “Market is asleep, Asia futures is asleep”
-		stock_trading_algo_main = stock_trading_turned_off
-		options_trading_algo = options_trading_turned_off
-		futures_trading_algo = futures_trading_afterhours_AsiaOff_mode
-    return (all the above stuff)
-
-  if 04:00:00 <= current_time < 07:00:00 :
-	  stock_trading_timeperiod = “Pre-Market, early morning, be patient!”
-	  print(f”Market Status:  Early Market Hours, no trading available”)
-	  stock_trading_algo_main = stock_trading_turned_off
-	  options_trading_algo = options_trading_turned_off
-	  futures_trading_algo = futures_trading_premarket_mode  
-    return (all the above stuff)
-
-  if 07:00:00 <= current_time < 09:00:00 :
-	  stock_trading_timeperiod = “Pre-Market activity open, get ready…!”
-	  print(f”Market Status:  Early Market Hours trading is currently open”)
-	  stock_trading_algo_main = stock_trading_premarket_mode
-	  options_trading_algo = options_trading_turned_off
-	  futures_trading_algo = futures_trading_premarket_mode
-    return (all the above stuff)
-
-  if 09:00:00 <= current_time < 09:30:00 :
-	  stock_trading_timeperiod = “30 minutes left until the bell, get set…!”
-	  print(f”Market Status:  Early Market Hours + early options is open”)
-	  stock_trading_algo_main = stock_trading_premarket_mode()
-	  options_trading_algo = options_trading_premarket_mode()
-	  futures_trading_algo = futures_trading_turned_on()
-    return (all the above stuff)
-  
-  if 09:30:00 <= current_time < 16:00:00 :
-	  stock_trading_timeperiod = “Market Open! GO GO GO!!!”
-	  print(f”Market Status:  Market Open”)
-	  stock_trading_algo_main = stock_trading_market_mode
-	  options_trading_algo = options_trading_market_mode
-	  futures_trading_algo = futures_trading_turned_on
-    return (all the above stuff)
-
-  if 16:00:00 <= current_time < 16:15:00 :
-	  stock_trading_timeperiod = “Post Market Hours, Limited options window”
-	  print(f”Market Status:  Afterhours… options afterhours”)
-	  stock_trading_algo_main = stock_trading_afterhours_mode
-	  options_trading_algo = options_trading_afterhours_mode
-	  futures_trading_algo = futures_trading_turned_on
-    return (all the above stuff)
-
-  if 17:00:00 <= current_time < 18:00:00 :
-	  stock_trading_timeperiod = “Post Market Hours, Options post market window”
-	  print(f”Market Status:  Afterhours, American futures market closed”)
-	  stock_trading_algo_main = stock_trading_afterhours
-	  options_trading_algo = options_trading_turned_afterhours
-	  futures_trading_algo = futures_trading_closed
-    return (all the above stuff)
-
- 
+# (label, low price, high price)
+Stock_Price_Small = [
+    ("Small Penny", 0.40, 1.95),
+    ("Medium Penny", 1.96, 4.95),
+    ("Large Penny", 4.96, 17.95)]
+Stock_Price_Medium = [
+    ("Smaller Medium", 17.96, 37.95),
+    ("Larger Medium", 37.96, 72.49)]
+Stock_Price_Large = [
+    ("Large, 1of4", 72.50, 149.95),
+    ("Large, 2of4", 149.96, 299.95),
+    ("Large, 3of4", 299.96, 499.95),
+    ("Large, 4of4", 499.96, 799.95)]
+Stock_Price_Huge = [
+    ("Smaller Huge", 799.96, 1499.95),
+    ("Larger Huge", 1499.96, 9995.00)]
+
+
+# --- Trading states ---
+# Each state is (timeperiod description, stock algo mode, options algo mode, futures algo mode).
 # Sunday 6pm to Friday 5pm, futures is open,
-# with the exception from 5 pm to 6 pm (EST), wherein my access to the futures market closes 
-  if 17:00:00 <= current_time < 18:00:00 :  # give futures a 2 minute window for safety
-	  stock_trading_timeperiod = “Post Market Hours, Options post market window”
-	  print(f”Market Status:  Afterhours… options afterhours”)
-	  stock_trading_algo_main = stock_trading_turned_afterhours
-	  options_trading_algo = options_trading_turned_afterhours
-	  futures_trading_algo = futures_trading_turned_on
-    return (all the above stuff)
-  
-  if 16:15:00 <= current_time < 20:00:00 :
-		stock_trading_timeperiod = “Post Market Hours, options closed”
-		print(f”Market Status:  Afterhour trading, options closed”)
-		stock_trading_algo_main = stock_trading_afterhours
-		options_trading_algo = options_trading_turned_off
-		futures_trading_algo = futures_trading_turned_on
-    return (all the above stuff)
-
-	if 00:00:00 <= current_time < 04:00:00 or
-    (current_time >20:00:00) :
-		market_trading_timeperiod = “Market is asleep, slow futures… zzz …”
-		stock_trading_algo_main = stock_trading_turned_off
-		options_trading_algo = options_trading_turned_off
-		futures_trading_algo = futures_trading_afterhours_gentle_mode
+# with the exception from 5 pm to 6 pm (EST), wherein my access to the futures market closes.
+ALL_ASLEEP_STATE = (
+    "Everything is asleep for now.  Chill out.",
+    "stock_trading_turned_off", "options_trading_turned_off", "futures_trading_turned_off")
+SUNDAY_FUTURES_STATE = (
+    "Market is asleep, futures awake.",
+    "stock_trading_turned_off", "options_trading_turned_off", "futures_trading_preMonday_mode")
+ASLEEP_SLOW_FUTURES_STATE = (
+    "Market is asleep, slow futures… zzz …",
+    "stock_trading_turned_off", "options_trading_turned_off", "futures_trading_afterhours_gentle_mode")
+ASLEEP_ASIA_OFF_STATE = (
+    "Market is asleep, Asia futures is asleep",
+    "stock_trading_turned_off", "options_trading_turned_off", "futures_trading_afterhours_AsiaOff_mode")
+PREMARKET_EARLY_STATE = (
+    "Pre-Market, early morning, be patient!",
+    "stock_trading_turned_off", "options_trading_turned_off", "futures_trading_premarket_mode")
+PREMARKET_OPEN_STATE = (
+    "Pre-Market activity open, get ready…!",
+    "stock_trading_premarket_mode", "options_trading_turned_off", "futures_trading_premarket_mode")
+PREMARKET_OPTIONS_STATE = (
+    "30 minutes left until the bell, get set…!",
+    "stock_trading_premarket_mode", "options_trading_premarket_mode", "futures_trading_turned_on")
+MARKET_OPEN_STATE = (
+    "Market Open! GO GO GO!!!",
+    "stock_trading_market_mode", "options_trading_market_mode", "futures_trading_turned_on")
+POSTMARKET_OPTIONS_STATE = (
+    "Post Market Hours, Limited options window",
+    "stock_trading_afterhours_mode", "options_trading_afterhours_mode", "futures_trading_turned_on")
+POSTMARKET_FUTURES_CLOSED_STATE = (
+    "Post Market Hours, Options post market window",
+    "stock_trading_afterhours", "options_trading_afterhours", "futures_trading_closed")
+POSTMARKET_OPTIONS_CLOSED_STATE = (
+    "Post Market Hours, options closed",
+    "stock_trading_afterhours", "options_trading_turned_off", "futures_trading_turned_on")
+
+
+# --- Minute-of-day dispatch tables ---
+# One 1440-entry table per weekday, indexed by hour*60 + minute (Eastern time).
+# Ranges are half-open [start, end) and must tile the whole day exactly once,
+# so overlapping or missing windows fail at import instead of falling through.
+def _build_minute_table(ranges):
+    table = [None] * 1440
+    for (start_h, start_m), (end_h, end_m), state in ranges:
+        for minute in range(start_h * 60 + start_m, end_h * 60 + end_m):
+            if table[minute] is not None:
+                raise ValueError(f"Overlapping trading windows at minute {minute}")
+            table[minute] = state
+    if None in table:
+        raise ValueError(f"No trading window covers minute {table.index(None)}")
+    return tuple(table)
+
+
+_WEEKDAY_MINUTE_TABLE = _build_minute_table([
+    ((0, 0), (2, 0), ASLEEP_SLOW_FUTURES_STATE),
+    # in futures program, give ourselves some room to breathe 2 min before and after Asian futures sleepy time
+    ((2, 0), (4, 0), ASLEEP_ASIA_OFF_STATE),
+    ((4, 0), (7, 0), PREMARKET_EARLY_STATE),
+    ((7, 0), (9, 0), PREMARKET_OPEN_STATE),
+    ((9, 0), (9, 30), PREMARKET_OPTIONS_STATE),
+    ((9, 30), (16, 0), MARKET_OPEN_STATE),
+    ((16, 0), (16, 15), POSTMARKET_OPTIONS_STATE),
+    ((16, 15), (17, 0), POSTMARKET_OPTIONS_CLOSED_STATE),
+    ((17, 0), (18, 0), POSTMARKET_FUTURES_CLOSED_STATE),
+    ((18, 0), (20, 0), POSTMARKET_OPTIONS_CLOSED_STATE),
+    ((20, 0), (24, 0), ASLEEP_SLOW_FUTURES_STATE),
+])
+
+_SATURDAY_MINUTE_TABLE = _build_minute_table([
+    ((0, 0), (24, 0), ALL_ASLEEP_STATE),
+])
+
+_SUNDAY_MINUTE_TABLE = _build_minute_table([
+    ((0, 0), (18, 0), ALL_ASLEEP_STATE),
+    ((18, 0), (24, 0), SUNDAY_FUTURES_STATE),
+])
+
+# Indexed by datetime.weekday(): Monday=0 ... Sunday=6
+_MINUTE_TABLES = (_WEEKDAY_MINUTE_TABLE,) * 5 + (_SATURDAY_MINUTE_TABLE, _SUNDAY_MINUTE_TABLE)
+
+
+def weekday_market_machine(current_time):
+    # current_time: Eastern-time datetime (or time) on a non-excluded weekday
+    return _WEEKDAY_MINUTE_TABLE[current_time.hour * 60 + current_time.minute]
+
+
+def division_of_time_based_operation(current_time):
+    # current_time: Eastern-time datetime; convert to EST before calling if needed.
+    # Returns the trading state for this minute, or None on an excluded weekday.
+    weekday = current_time.weekday()
+    if weekday < 5 and not is_valid_trading_day(
+            datetime(current_time.year, current_time.month, current_time.day)):
+        return None
+    return _MINUTE_TABLES[weekday][current_time.hour * 60 + current_time.minute]
+
+# NOTE: may be able to bypass the year-specific import with:
+# from exclusions.exclusions_2024 import (    #change the year as needed
+#     is_valid_trading_day,
+#     exit_time_on_fomc_day,
+#     exit_time_on_half_day,
+#     powell_speech_blackout,
+#     quad_witching_exit_time,
+#     nfp_trading_restrictions,
+#     election_day_halt
 
 
 '''
@@ -16,9 +16,56 @@
 # Confidence-based risk modulation using classification strings
 # Note A: Classification strings may include source metadata (e.g. signal family, IV level, float flag)
 
+import collections
 import datetime
+import functools
+import re
+import time
+
+# Confidence tier tokens and their position-size scale factors.
+# When several tokens appear in one classification string, the highest tier wins.
+_TIER_RE = re.compile(r'a_|high|b_|med|c_|low')
+_TIER_SCALE = {
+    'a_': 1.0, 'high': 1.0,    # full position size
+    'b_': 0.65, 'med': 0.65,
+    'c_': 0.4, 'low': 0.4,     # See Note A above
+}
+_UNCLASSIFIED_SCALE = 0.25     # unknown or unclassified => small
+
+RECENT_PNL_HISTORY = 1024      # trade P&Ls retained per protocol instance
+_HOUR_NS = 3_600_000_000_000   # trade-frequency window, in monotonic nanoseconds
+
+
+@functools.lru_cache(maxsize=512)
+def _confidence_scale(classification):
+    # Classification strings repeat heavily across trades, so results are memoized
+    return max((_TIER_SCALE[tok] for tok in _TIER_RE.findall(classification.lower())),
+               default=_UNCLASSIFIED_SCALE)
+
+
+@functools.lru_cache(maxsize=2048)
+def _validate_pure(max_position_size_pct, classification, position_size_pct):
+    # Pure part of validate_trade_request; SIS re-queries the same (class, size) pairs often.
+    # Keyed on the exact size so cached answers can never loosen the limit.
+    scaled_limit = max_position_size_pct * _confidence_scale(classification)
+
+    if position_size_pct > scaled_limit:
+        return False, f"Position exceeds scaled limit for class '{classification}'."
+
+    return True, "Trade permitted."
+
 
 class RiskExecutionProtocol:
+    # Fixed attribute set: no per-instance __dict__, one protocol object per sub-portfolio stays small
+    __slots__ = (
+        'account_equity', 'tier',
+        'max_position_size_pct', 'max_trades_per_hour',
+        'max_daily_drawdown_pct', 'max_trade_drawdown_pct',
+        'daily_loss_total', 'trades_today', 'recent_pnls', 'last_trade_time',
+        'execution_frozen', 'throttle_mode', 'throttle_trigger_pct', 'throttle_scaling',
+        'locked_due_to_freq', 'trade_timestamps',
+    )
+
     def __init__(self, account_equity):
         self.account_equity = account_equity
         self.tier = self._define_tier()
@@ -37,7 +84,8 @@ class RiskExecutionProtocol:
         self.max_daily_drawdown_pct = 0.04
         self.max_trade_drawdown_pct = 0.015
         self.daily_loss_total = 0.0
-        self.trade_history = []
+        self.trades_today = 0
+        self.recent_pnls = collections.deque(maxlen=RECENT_PNL_HISTORY)  # bounded, for diagnostics only
         self.last_trade_time = None
 
         self.execution_frozen = False
@@ -46,7 +94,7 @@ class RiskExecutionProtocol:
         self.throttle_scaling = 0.5
 
         self.locked_due_to_freq = False
-        self.trade_timestamps = []
+        self.trade_timestamps = collections.deque()  # time.monotonic_ns() of primary entries within the last hour, oldest first
 
     def _define_tier(self):
         if self.account_equity < 2000:
@@ -61,15 +109,7 @@ class RiskExecutionProtocol:
         Scale risk dynamically based on signal confidence.
         Accepts confidence tags like 'A_2_X', 'HiRSI.LowFloat.x,y,z'
         """
-        tag = classification.lower()
-        if "a_" in tag or "high" in tag:
-            return 1.0  # full position size
-        elif "b_" in tag or "med" in tag:
-            return 0.65
-        elif "c_" in tag or "low" in tag:
-            return 0.4  #See Note A above
-        else:
-            return 0.25  # unknown or unclassified => small
+        return _confidence_scale(classification)
 
     def validate_trade_request(self, classification, position_size_pct):
         """
@@ -79,48 +119,54 @@ class RiskExecutionProtocol:
         if self.execution_frozen:
             return False, "Execution frozen. Trade denied."
 
-        scale_factor = self._risk_scaling_from_confidence(classification)
-        scaled_limit = self.max_position_size_pct * scale_factor
-
-        if position_size_pct > scaled_limit:
-            return False, f"Position exceeds scaled limit for class '{classification}'."
-
-        return True, "Trade permitted."
+        return _validate_pure(self.max_position_size_pct, classification, position_size_pct)
 
     def record_trade(self, pnl_pct, position_size_pct, trade_type="entry", operation_type="primary", classification=""):
-        if self.execution_frozen and trade_type == "entry" and operation_type == "primary":
-            return "Execution frozen. No further primary entries allowed."
-
-        now = datetime.datetime.utcnow()
-        if trade_type == "entry" and operation_type == "primary":
-            self.trade_timestamps.append(now)
-            self.trade_timestamps = [t for t in self.trade_timestamps if (now - t).seconds < 3600]
-
-            if len(self.trade_timestamps) > self.max_trades_per_hour:
+        # Once frozen, nothing is recorded (exits and adjustments included) until reset_daily_risk(),
+        # so post-freeze retries return before any timestamp or scaling work.
+        if self.execution_frozen:
+            return "Execution frozen. No further trades recorded."
+
+        # Hot path: attributes read more than once are bound to locals; state changes still go to self
+        is_primary_entry = trade_type == "entry" and operation_type == "primary"
+        if is_primary_entry:
+            # Integer monotonic clock: no datetime allocation, immune to wall-clock jumps
+            now_ns = time.monotonic_ns()
+            timestamps = self.trade_timestamps
+            cutoff = now_ns - _HOUR_NS
+            while timestamps and timestamps[0] <= cutoff:
+                timestamps.popleft()
+            timestamps.append(now_ns)
+
+            if len(timestamps) > self.max_trades_per_hour:
                 self.execution_frozen = True
                 self.locked_due_to_freq = True
                 return "Entry frequency exceeded. New primary entries blocked."
 
-            scale_factor = self._risk_scaling_from_confidence(classification)
-            scaled_limit = self.max_position_size_pct * scale_factor
+            scaled_limit = self.max_position_size_pct * _confidence_scale(classification)
 
             if position_size_pct > scaled_limit:
                 self.execution_frozen = True
                 return f"Trade size too large ({position_size_pct:.2%}) for confidence class '{classification}'. Execution frozen."
 
-        self.trade_history.append(pnl_pct)
-        self.daily_loss_total += pnl_pct if pnl_pct < 0 else 0
-        self.last_trade_time = now
+        self.trades_today += 1
+        self.recent_pnls.append(pnl_pct)
+        daily_loss_total = self.daily_loss_total
+        if pnl_pct < 0:
+            daily_loss_total += pnl_pct
+            self.daily_loss_total = daily_loss_total
+        self.last_trade_time = datetime.datetime.utcnow()  # wall clock, for status reporting only
 
         if pnl_pct < -self.max_trade_drawdown_pct:
             self.execution_frozen = True
             return f"Trade loss exceeded limit ({pnl_pct:.2%}). Execution frozen."
 
-        if abs(self.daily_loss_total) > self.max_daily_drawdown_pct:
+        daily_loss_abs = abs(daily_loss_total)
+        if daily_loss_abs > self.max_daily_drawdown_pct:
             self.execution_frozen = True
-            return f"Daily loss limit exceeded ({self.daily_loss_total:.2%}). Execution frozen."
+            return f"Daily loss limit exceeded ({daily_loss_total:.2%}). Execution frozen."
 
-        if abs(self.daily_loss_total) > self.throttle_trigger_pct:
+        if daily_loss_abs > self.throttle_trigger_pct:
             self.throttle_mode = True
 
         return "Trade recorded."
@@ -130,7 +176,8 @@ class RiskExecutionProtocol:
 
     def reset_daily_risk(self):
         self.daily_loss_total = 0.0
-        self.trade_history.clear()
+        self.trades_today = 0
+        self.recent_pnls.clear()
         self.trade_timestamps.clear()
         self.execution_frozen = False
         self.throttle_mode = False
@@ -142,7 +189,7 @@ class RiskExecutionProtocol:
             'account_equity': self.account_equity,
             'capital_tier': self.tier,
             'daily_loss_total': self.daily_loss_total,
-            'trades_today': len(self.trade_history),
+            'trades_today': self.trades_today,
             'execution_frozen': self.execution_frozen,
             'throttle_mode': self.throttle_mode,
             'locked_due_to_freq': self.locked_due_to_freq,
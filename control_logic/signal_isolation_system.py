@@ -13,18 +13,79 @@
 # - Manual override logic with audit trail
 # - (NEW) Compliance Cloaking Layer (CCL) for operational integrity and trace obfuscation
 
+import functools
 import hashlib
-import json
 import datetime
+from collections import deque
+from itertools import islice
+
+from core.serialization import dumps_json
+
+# Signal IDs are hashed only to keep raw IDs out of the CCL log, so the fast non-cryptographic
+# xxh3_128 is preferred; SHA-256 is the fallback when xxhash isn't installed.
+# The same ID is logged several times (approval, override, ...), so digests are memoized.
+try:
+    import xxhash
+
+    @functools.lru_cache(maxsize=8192)
+    def _hash_signal_id(signal_id):
+        return xxhash.xxh3_128_hexdigest(signal_id.encode())
+except ImportError:
+    @functools.lru_cache(maxsize=8192)
+    def _hash_signal_id(signal_id):
+        return hashlib.sha256(signal_id.encode()).hexdigest()
+
+# Each input domain owns one bit, so a packet's agreeing domains fold into a single int
+# and the agreement count is int.bit_count() (a POPCNT) instead of a Python-level sum.
+DOMAIN_BITS = {
+    'technical': 1 << 0,
+    'order_flow': 1 << 1,
+    'volatility': 1 << 2,
+    'behavioral': 1 << 3,
+    'market_regime': 1 << 4,
+    'multi_day_rsi': 1 << 5,
+    'continuance': 1 << 6,
+    'options_skew': 1 << 7,
+}
+
+def domain_mask(inputs):
+    """
+    Returns (mask, extra): the bitmask of expected domains in `inputs` whose flag is truthy,
+    and the number of truthy inputs outside the expected set, which still count toward agreement.
+    """
+    mask = 0
+    extra = 0
+    for key, val in inputs.items():
+        if val:
+            bit = DOMAIN_BITS.get(key)
+            if bit is None:
+                extra += 1
+            else:
+                mask |= bit
+    return mask, extra
+
+def agree_count(inputs):  # Number of domains in `inputs` with a truthy flag
+    mask, extra = domain_mask(inputs)
+    return mask.bit_count() + extra
+
+# In-memory log retention; the compliance summary counters cover the full history regardless
+EXECUTION_LOG_MAXLEN = 10_000
+OVERRIDE_LOG_MAXLEN = 1_000
 
 # SIS Core Logic Skeleton
 
 class SignalIsolationSystem:
+    __slots__ = ('multi_factor_threshold', 'override_enabled', 'override_log', 'execution_log',
+                 '_executions', '_approved', '_overridden')
+
     def __init__(self):
         self.multi_factor_threshold = 3  # Number of domains required to agree
         self.override_enabled = True
-        self.override_log = []
-        self.execution_log = []  # For CCL synthetic reporting
+        self.override_log = deque(maxlen=OVERRIDE_LOG_MAXLEN)
+        self.execution_log = deque(maxlen=EXECUTION_LOG_MAXLEN)  # For CCL synthetic reporting
+        self._executions = 0  # running totals, so the summary never rescans the log
+        self._approved = 0
+        self._overridden = 0
 
     def multi_factor_confirm(self, inputs):
         """
@@ -39,8 +100,7 @@ class SignalIsolationSystem:
             - 'continuance': confirmation of breakout continuation via higher highs/lows
             - 'options_skew': call/put skew divergence, unusual OI imbalance
         """
-        agreement_count = sum(1 for val in inputs.values() if val)
-        return agreement_count >= self.multi_factor_threshold
+        return agree_count(inputs) >= self.multi_factor_threshold
 
     def allow_trade(self, signal_packet):
         """
@@ -49,12 +109,11 @@ class SignalIsolationSystem:
             - 'inputs': signal flags from various domains (see above)
             - 'timestamp': event time
         """
-        approved = self.multi_factor_confirm(signal_packet['inputs'])
-        if approved:
-            self.log_execution(signal_packet, approved=True)
-            return True  # Pass to execution layer
-        self.log_execution(signal_packet, approved=False)
-        return False
+        inputs = signal_packet['inputs']
+        agree = agree_count(inputs)
+        approved = agree >= self.multi_factor_threshold
+        self.log_execution(signal_packet, approved=approved, agree=agree, n=len(inputs))
+        return approved  # True passes to execution layer
 
     def trigger_override(self, signal_packet, user_id, justification):
         """
@@ -77,35 +136,45 @@ class SignalIsolationSystem:
         """
         Returns recent override actions for behavioral risk analysis.
         """
-        return self.override_log[-5:]  # Return last 5 overrides for review
+        return list(islice(reversed(self.override_log), 5))[::-1]  # Return last 5 overrides for review
 
     # === Compliance Cloaking Layer (CCL) ===
 
-    def log_execution(self, signal_packet, approved, overridden=False):
+    def log_execution(self, signal_packet, approved, overridden=False, agree=None, n=None):
         """
         Stores sanitized, hashed trade log for audit safety and internal review.
+        agree, n: agreeing-domain and total input counts, if the caller already has them.
         """
+        if agree is None or n is None:
+            inputs = signal_packet['inputs']
+            agree = agree_count(inputs)
+            n = len(inputs)
         log_entry = {
-            'signal_id_hash': hashlib.sha256(signal_packet['id'].encode()).hexdigest(),
+            'signal_id_hash': _hash_signal_id(signal_packet['id']),
             'timestamp': signal_packet['timestamp'],
             'approved': approved,
             'overridden': overridden,
             'meta': {
-                'input_count': len(signal_packet['inputs']),
-                'agree_count': sum(1 for val in signal_packet['inputs'].values() if val)
+                'input_count': n,
+                'agree_count': agree
             }
         }
         self.execution_log.append(log_entry)
+        self._executions += 1
+        if approved:
+            self._approved += 1
+        if overridden:
+            self._overridden += 1
 
     def generate_compliance_summary(self):
         """
         Creates a sanitized summary for external stakeholders, preserving privacy.
         """
-        return json.dumps({
-            'executions_logged': len(self.execution_log),
-            'approved_trades': sum(1 for x in self.execution_log if x['approved']),
-            'overrides_used': sum(1 for x in self.execution_log if x['overridden'])
-        }, indent=2)
+        return dumps_json({
+            'executions_logged': self._executions,
+            'approved_trades': self._approved,
+            'overrides_used': self._overridden
+        }, indent=True).decode()
 
     def lockdown(self):
         """
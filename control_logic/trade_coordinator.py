@@ -35,41 +35,113 @@
 -Work towards Delegation of Execution
 '''
 
+import array
+import bisect
+import sys
 import time
-# from collections import deque  # Correct this when proper pathway is discovered
+from collections import deque
+from dataclasses import dataclass, field, fields
+from itertools import islice
+from datetime import datetime, timedelta
+
+MAX_PACKET_AGE = timedelta(minutes=5)
+DECISION_LOG_MAXLEN = 10_000  # most recent decisions kept in memory
+
+# Fixed decision labels, interned once so every logged decision shares a single copy
+APPROVED = sys.intern('APPROVED')
+REJECTED = sys.intern('REJECTED')
+MARGIN_RISK_CASH_EQUITY = sys.intern('Low (cash equity margin)')
+MARGIN_RISK_SHORT_LEG = sys.intern('Moderate to High (requires margin coverage on short leg)')
+MARGIN_RISK_INELIGIBLE = sys.intern('Ineligible: naked short option in cash-only account')
+MARGIN_RISK_LOW = sys.intern('Low')
+
+# (margin_enabled, involves_short_option) -> margin risk label
+_MARGIN_RISK = {
+    (True, False): MARGIN_RISK_CASH_EQUITY,
+    (True, True): MARGIN_RISK_SHORT_LEG,
+    (False, True): MARGIN_RISK_INELIGIBLE,
+    (False, False): MARGIN_RISK_LOW,
+}
+
+@dataclass(slots=True)
+class Decision:  # One trade evaluation; slotted, and only turned into a dict when read out
+    signal_id: str
+    timestamp: str
+    inputs: dict
+    confidence_tag: str = 'unclassified'
+    risk_pct: float = 0.01
+    suitable: bool = False
+    permitted: bool = False
+    tax_notes: list = field(default_factory=list)
+    margin_risk: str = ''
+    split_adjusted: bool = False
+    spinoff_event: bool = False
+    final_decision: str = REJECTED
+    reason: str = ''
+
+    def to_dict(self):  # Same keys and order as the decision dicts this class replaced
+        return {name: getattr(self, name) for name in _DECISION_FIELDS}
+
+    # Read-only dict-style access, so decision['final_decision'] and decision.get('error') keep working
+    def __getitem__(self, key):
+        if key not in _DECISION_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _DECISION_FIELDS else default
+
+_DECISION_FIELDS = tuple(f.name for f in fields(Decision))  # resolved once, not per to_dict() call
 
 # The RateLimiter class controls the number of incoming signals per second, to prevent overload.
+# Accepted-signal times live in a fixed ring of burst_limit slots; the slot about to be
+# overwritten is the oldest, so one comparison decides whether the 1-second window is full.
 
 class RateLimiter: 
+    __slots__ = ('max_packets_per_sec', 'burst_limit', 'buf', 'head', 'count')
+
     def __init__(self, max_packets_per_sec=5, burst_limit=10):  # Initializes rate limits
-        self.timestamps = deque()
         self.max_packets_per_sec = max_packets_per_sec
         self.burst_limit = burst_limit
+        self.buf = array.array('d', [0.0] * burst_limit)  # time.monotonic() of accepted signals
+        self.head = 0   # index of the oldest slot, i.e. the next one to overwrite
+        self.count = 0  # slots filled so far, saturates at burst_limit
 
     def allow(self):  # Checks if current rate of signal intake is within limits
-        now = time.time()
-        self.timestamps.append(now)
-        while self.timestamps and now - self.timestamps[0] > 1:
-            self.timestamps.popleft()
-        return len(self.timestamps) <= self.burst_limit
+        now = time.monotonic()
+        head = self.head
+        if self.count >= self.burst_limit and now - self.buf[head] <= 1.0:
+            return False
+        self.buf[head] = now
+        self.head = (head + 1) % self.burst_limit
+        if self.count < self.burst_limit:
+            self.count += 1
+        return True
 
 class PacketSanitizer:  # Ensures incoming signal packets are safe, valid, and clean
+    __slots__ = ('max_length',)
+
     def __init__(self, max_length=4096):  # Sets maximum acceptable field length
         self.max_length = max_length
 
     def validate_timestamp(self, timestamp_str):  # Ensures timestamp is ISO, not future, and within 5 minutes
-        from datetime import datetime, timedelta
+        # fromisoformat is C-level and far cheaper than re-parsing a strptime format per packet.
+        # It also accepts looser forms (date only, no seconds, fractions, offsets), so the exact
+        # 'YYYY-MM-DDTHH:MM:SSZ' shape is checked first; together they match the old strptime format.
         try:
-            packet_time = datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%SZ")
-        except ValueError:
+            if (len(timestamp_str) != 20 or timestamp_str[10] != 'T' or timestamp_str[19] != 'Z'
+                    or timestamp_str[4] != '-' or timestamp_str[7] != '-'
+                    or timestamp_str[13] != ':' or timestamp_str[16] != ':'):
+                raise ValueError
+            packet_time = datetime.fromisoformat(timestamp_str[:-1])
+        except (ValueError, AttributeError, TypeError):
             raise ValueError("Invalid timestamp format. Expected ISO format (e.g., 2025-04-09T14:33:00Z)")
 
         now = datetime.utcnow()
         if packet_time > now:
             raise ValueError("Timestamp is in the future")
-        if now - packet_time > timedelta(minutes=5):
+        if now - packet_time > MAX_PACKET_AGE:
             raise ValueError("Timestamp is older than 5 minutes")
-            self.validate_timestamp(packet.get('timestamp', ''))
         return True
 
     def sanitize(self, packet):  # Checks structure and field size of incoming signal packet
@@ -81,14 +153,19 @@ class PacketSanitizer:  # Ensures incoming signal packets are safe, valid, and c
 
 class TradeCoordinator:  # Central brain for coordinating SIS, REP, TaxFilter, and security logic
     # Includes anomaly throttling to prevent execution under synthetic or distorted input conditions
+    __slots__ = ('sis', 'rep', 'tax_filter', 'decision_log', '_decision_by_id',
+                 'symbol_registry', 'split_log', 'spinoff_log', 'ratelimiter', 'sanitizer',
+                 'anomaly_cooldown', 'last_safe_trade_time')
+
     def __init__(self, sis, rep, tax_filter):  # Initializes coordinator with subsystems and logs
         self.sis = sis
         self.rep = rep
         self.tax_filter = tax_filter
-        self.decision_log = []
+        self.decision_log = deque(maxlen=DECISION_LOG_MAXLEN)
+        self._decision_by_id = {}  # signal_id -> latest decision still held in decision_log
         self.symbol_registry = {}
-        self.split_log = []
-        self.spinoff_log = []
+        self.split_log = {}    # symbol -> [(date_str, factor), ...] kept sorted by date
+        self.spinoff_log = {}  # parent symbol -> [{'parent', 'child', 'date'}, ...]
         self.ratelimiter = RateLimiter()
         self.sanitizer = PacketSanitizer()
         self.anomaly_cooldown = 90.41  # seconds between trades during integrity faults
@@ -98,25 +175,26 @@ class TradeCoordinator:  # Central brain for coordinating SIS, REP, TaxFilter, a
         self.symbol_registry[old_symbol] = new_symbol
 
     def register_split(self, symbol, date_str, factor):  # Logs share splits for historical normalization
-        self.split_log.append({ 'symbol': symbol, 'date': date_str, 'factor': factor })
+        bisect.insort(self.split_log.setdefault(symbol, []), (date_str, factor))
 
     def register_spinoff(self, parent_symbol, child_symbol, date_str):  # Logs asset spin-offs
-        self.spinoff_log.append({ 'parent': parent_symbol, 'child': child_symbol, 'date': date_str })
+        self.spinoff_log.setdefault(parent_symbol, []).append(
+            { 'parent': parent_symbol, 'child': child_symbol, 'date': date_str })
 
-    def get_split_factor(self, symbol, date_str):  # Retrieves the applicable split ratio for a date
-        for entry in self.split_log:
-            if entry['symbol'] == symbol and entry['date'] <= date_str:
-                return entry['factor']
-        return 1.0
+    def get_split_factor(self, symbol, date_str):  # Retrieves the most recent split ratio on or before a date
+        splits = self.split_log.get(symbol)
+        if not splits:
+            return 1.0
+        i = bisect.bisect_right(splits, (date_str, float('inf'))) - 1
+        return splits[i][1] if i >= 0 else 1.0
 
     def get_current_symbol(self, input_symbol):  # Resolves renamed symbols via registry
         return self.symbol_registry.get(input_symbol, input_symbol)
 
     def list_spinoffs_for(self, symbol):  # Returns a list of known spin-off assets
-        return [s['child'] for s in self.spinoff_log if s['parent'] == symbol]
+        return [s['child'] for s in self.spinoff_log.get(symbol, ())]
 
     def process_signal(self, signal_packet):  # Core decision pipeline: SIS + REP + Tax + Security + Anomaly Check
-        import time
         now = time.time()
 
         if now - self.last_safe_trade_time < self.anomaly_cooldown:
@@ -130,69 +208,62 @@ class TradeCoordinator:  # Central brain for coordinating SIS, REP, TaxFilter, a
         except ValueError as e:
             return {'error': f'Packet rejected: {str(e)}'}
 
-        decision = {
-            'signal_id': signal_packet['id'],
-            'timestamp': signal_packet['timestamp'],
-            'inputs': signal_packet['inputs'],
-            'confidence_tag': signal_packet.get('confidence_tag', 'unclassified'),
-            'risk_pct': signal_packet.get('risk_pct', 0.01),
-            'suitable': False,
-            'permitted': False,
-            'tax_notes': [],
-            'margin_risk': '',
-            'split_adjusted': signal_packet.get('split_adjusted', False),
-            'spinoff_event': signal_packet.get('spinoff_event', False),
-            'final_decision': 'REJECTED',
-            'reason': ''
-        }
-
-        allowed_by_sis = self.sis.allow_trade(signal_packet)
-        decision['suitable'] = allowed_by_sis
-
-        if not allowed_by_sis:
-            decision['reason'] = 'SIS filter rejected signal'
-                    self.last_safe_trade_time = now
-        self.decision_log.append(decision)
+        # Unpack the packet once; everything below works from locals
+        sp = signal_packet
+        get = sp.get
+        sid, ts, inputs = sp['id'], sp['timestamp'], sp['inputs']
+        conf = get('confidence_tag', 'unclassified')
+        risk = get('risk_pct', 0.01)
+        symbol = get('symbol', 'UNKNOWN')
+        holding_days = get('holding_days', 0)
+        realized = get('realized', False)
+        margin_enabled = get('margin_enabled', False)
+        involves_short_option = get('involves_short_option', False)
+
+        decision = Decision(sid, ts, inputs, conf, risk,
+                            split_adjusted=get('split_adjusted', False),
+                            spinoff_event=get('spinoff_event', False))
+
+        allowed_by_sis = self.sis.allow_trade(sp)
+        decision.suitable = allowed_by_sis
+
+        if not allowed_by_sis:  # Rejects are logged but don't start the anomaly cooldown
+            decision.reason = 'SIS filter rejected signal'
+            self._record_decision(decision)
             return decision
 
         rep_ok, reason = self.rep.validate_trade_request(
-            classification=decision['confidence_tag'],
-            position_size_pct=decision['risk_pct']
+            classification=conf,
+            position_size_pct=risk
         )
-        decision['permitted'] = rep_ok
-        decision['reason'] = reason
+        decision.permitted = rep_ok
+        decision.reason = reason
 
-        symbol = signal_packet.get('symbol', 'UNKNOWN')
         current_symbol = self.get_current_symbol(symbol)
-        trade_date_str = decision['timestamp'].split('T')[0]
-        holding_days = signal_packet.get('holding_days', 0)
-        realized = signal_packet.get('realized', False)
-        decision['tax_notes'] = self.tax_filter.evaluate_trade_tax_notes(
+        trade_date_str = ts.partition('T')[0]
+        decision.tax_notes = self.tax_filter.evaluate_trade_tax_notes(
             current_symbol, trade_date_str, holding_days, realized)
 
-        margin_enabled = signal_packet.get('margin_enabled', False)
-        involves_short_option = signal_packet.get('involves_short_option', False)
-
-        if margin_enabled and not involves_short_option:
-            decision['margin_risk'] = 'Low (cash equity margin)'
-        elif margin_enabled and involves_short_option:
-            decision['margin_risk'] = 'Moderate to High (requires margin coverage on short leg)'
-        elif not margin_enabled and involves_short_option:
-            decision['margin_risk'] = 'Ineligible: naked short option in cash-only account'
-        else:
-            decision['margin_risk'] = 'Low'
+        decision.margin_risk = _MARGIN_RISK[bool(margin_enabled), bool(involves_short_option)]
 
-        if allowed_by_sis and rep_ok:
-            decision['final_decision'] = 'APPROVED'
+        if rep_ok:
+            decision.final_decision = APPROVED
+            self.last_safe_trade_time = now
 
-        self.decision_log.append(decision)
-        return decision
+        self._record_decision(decision)
+        return decision  # call to_dict() where a plain dict is needed (e.g. JSON export)
 
     def recent_decisions(self, n=5):  # Returns the last n trade evaluations
-        return self.decision_log[-n:]
-
-    def get_decision_by_id(self, signal_id):  # Looks up a specific signal's decision
-        for entry in reversed(self.decision_log):
-            if entry['signal_id'] == signal_id:
-                return entry
-        return None
+        return list(islice(reversed(self.decision_log), max(n, 0)))[::-1]
+
+    def _record_decision(self, decision):  # Appends to decision_log and keeps the id index in step
+        log = self.decision_log
+        if len(log) == log.maxlen:
+            evicted = log[0]
+            if self._decision_by_id.get(evicted.signal_id) is evicted:
+                del self._decision_by_id[evicted.signal_id]
+        log.append(decision)
+        self._decision_by_id[decision.signal_id] = decision
+
+    def get_decision_by_id(self, signal_id):  # Looks up a specific signal's most recent decision
+        return self._decision_by_id.get(signal_id)
@@ -6,34 +6,149 @@
 # Purpose:
 #    /This is an audit logger utility program
 
-import json
+import atexit
 import hashlib
-from datetime import datetime
+import queue
+import threading
+import time
+
+from core.serialization import dumps_json, iso_utc
+
+# Lines are hash-chained: curr = SHA-256(prev_digest + payload), starting from _GENESIS.
+# Editing, dropping, or reordering any line breaks every link after it (see verify_log).
+_GENESIS = b"GENESIS"
+_CHAIN_SEP = b" // prev: "
+_CURR_SEP = b" curr: "
+
+def _last_chain_hash(filepath):
+    # Resume the chain from the last line of an existing log, else start at genesis
+    try:
+        with open(filepath, "rb") as f:
+            f.seek(0, 2)
+            pos = f.tell()
+            tail = b""
+            while pos > 0 and tail.count(b"\n") < 2:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+    except FileNotFoundError:
+        return _GENESIS
+    lines = tail.rstrip(b"\n").rsplit(b"\n", 1)
+    last = lines[-1]
+    if _CURR_SEP not in last:
+        return _GENESIS
+    return bytes.fromhex(last.rsplit(_CURR_SEP, 1)[1].decode())
+
+def verify_log(filepath):
+    """
+    Replays the hash chain of an AuditLogger file.
+    Returns the number of verified lines; raises ValueError at the first broken link.
+    """
+    prev = _GENESIS
+    count = 0
+    with open(filepath, "rb") as f:
+        for line_no, line in enumerate(f, 1):
+            payload, _, links = line.rstrip(b"\n").rpartition(_CHAIN_SEP)
+            prev_hex, _, curr_hex = links.partition(_CURR_SEP)
+            h = hashlib.sha256(prev)
+            h.update(payload)
+            if prev_hex != prev.hex().encode() or curr_hex != h.hexdigest().encode():
+                raise ValueError(f"Audit chain broken at line {line_no} of {filepath}")
+            prev = h.digest()
+            count += 1
+    return count
+
+# Lines are hashed on the caller's thread and handed to one background writer, which
+# coalesces them into writes of up to WRITE_BATCH_BYTES or WRITE_BATCH_SEC worth of lines.
+WRITE_BATCH_BYTES = 1 << 16
+WRITE_BATCH_SEC = 0.010
 
 class AuditLogger:
+    __slots__ = ('filepath', '_fh', '_lock', '_prev_hash', '_q', '_writer')
+
     def __init__(self, filepath="decision_log.jsonl"):
         self.filepath = filepath
+        # One append handle for the logger's lifetime, touched only by the writer thread
+        self._fh = open(self.filepath, "ab", buffering=1 << 16)
+        self._lock = threading.Lock()  # orders chain hashing with queueing
+        self._prev_hash = _last_chain_hash(self.filepath)
+        self._q = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._drain, name="AuditLoggerWriter", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
 
     def log(self, mode, condition_type, bin_weights, features):
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": iso_utc(),
             "mode": mode,
             "market_condition": condition_type,
             "features": features,
             "bin_weights": bin_weights
         }
-        log_json = json.dumps(log_entry, sort_keys=True)
-        checksum = hashlib.sha256(log_json.encode()).hexdigest()
-        with open(self.filepath, "a") as f:
-            f.write(log_json + f" // sha256: {checksum}\n")
+        self._write(log_entry)
 
     def log_error(self, exception, features):
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": iso_utc(),
             "error": str(exception),
             "features": features
         }
-        log_json = json.dumps(log_entry, sort_keys=True)
-        checksum = hashlib.sha256(log_json.encode()).hexdigest()
-        with open(self.filepath, "a") as f:
-            f.write(log_json + f" // sha256: {checksum}\n")
+        self._write(log_entry)
+
+    def _write(self, log_entry):
+        # Each line: canonical (sorted-key) JSON, then the previous and current chain hashes.
+        # Queueing under the lock keeps file order identical to chain order.
+        payload = dumps_json(log_entry, sort_keys=True)
+        with self._lock:
+            prev = self._prev_hash
+            h = hashlib.sha256(prev)
+            h.update(payload)
+            curr = h.digest()
+            self._prev_hash = curr
+            self._q.put(payload + _CHAIN_SEP + prev.hex().encode() + _CURR_SEP + curr.hex().encode() + b"\n")
+
+    def _drain(self):
+        # Queue items are encoded lines, threading.Event markers from flush(), or None to stop
+        q = self._q
+        fh = self._fh
+        while True:
+            item = q.get()
+            batch = []
+            size = 0
+            deadline = time.monotonic() + WRITE_BATCH_SEC
+            while isinstance(item, bytes):
+                batch.append(item)
+                size += len(item)
+                remaining = deadline - time.monotonic()
+                if size >= WRITE_BATCH_BYTES or remaining <= 0:
+                    item = False
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    item = False
+            if batch:
+                fh.write(b"".join(batch))
+                fh.flush()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def flush(self):
+        # Block until every line logged so far has been handed to the OS
+        if self._writer.is_alive():
+            done = threading.Event()
+            self._q.put(done)
+            done.wait()
+
+    def close(self):
+        with self._lock:
+            if self._fh.closed:
+                return
+            if self._writer.is_alive():
+                self._q.put(None)
+                self._writer.join()
+            self._fh.close()
+        atexit.unregister(self.close)
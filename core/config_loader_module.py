@@ -8,6 +8,8 @@
 
 import configparser  # Built-in Python module for reading .ini configuration files
 import os
+from functools import cached_property
+from types import MappingProxyType
 
 class ConfigLoader:
     # This is responsible for reading values from a .ini-style configuration file.
@@ -20,11 +22,23 @@ class ConfigLoader:
         self.config = configparser.ConfigParser()
         self.config.read(config_path)
 
+        # Every value that parses as a number is cast once here, so get_float is a dict hit.
+        self._floats = {}
+        for section in self.config.sections():
+            for key, value in self.config[section].items():
+                try:
+                    self._floats[(section, key)] = float(value)
+                except ValueError:
+                    pass
+
     def get_float(self, section, key):
         # Collect single float value from a given section and key in the config file.
         # Example usage: get_float("GLOBAL_CONSTRAINTS", "max_bin_weight")
         
-        return float(self.config[section][key])
+        try:
+            return self._floats[(section, key)]
+        except KeyError:
+            return float(self.config[section][key])  # raises the usual KeyError/ValueError
 
     def get_str(self, section, key):
         # Fetch a string value from the config.
@@ -39,28 +53,34 @@ class ConfigLoader:
         
         return [item.strip() for item in self.config[section][key].split(",")]
 
-    def get_constraints(self):
+    # The bundles below are built on first access and then returned as the same read-only
+    # mapping every time; the get_* methods are kept for existing callers.
+
+    @cached_property
+    def constraints(self):
         # Bundle all global numeric constraints into a dictionary for easy use.
         # Typically used in strategy modules that allocate capital or enforce limits.
         
-        return {
+        return MappingProxyType({
             "max_bin_weight": self.get_float("GLOBAL_CONSTRAINTS", "max_bin_weight"),
             "min_bin_weight": self.get_float("GLOBAL_CONSTRAINTS", "min_bin_weight"),
             "total_portfolio_allocation": self.get_float("GLOBAL_CONSTRAINTS", "total_portfolio_allocation"),
             "liquidity_reserve": self.get_float("GLOBAL_CONSTRAINTS", "liquidity_reserve")
-        }
+        })
 
-    def get_model_params(self):
+    @cached_property
+    def model_params(self):
         # This returns hyperparameters for a machine learning model defined in config.
         # These values can be passed directly into model constructors like RandomForestClassifier.
         
-        return {
+        return MappingProxyType({
             "type": self.get_str("MODEL", "type"),  # For logging or conditional logic
             "n_estimators": int(self.config["MODEL"]["n_estimators"]),
             "random_state": int(self.config["MODEL"]["random_state"])
-        }
+        })
 
-    def get_data_spec(self):
+    @cached_property
+    def data_spec(self):
         '''
         Retrieves dataset configuration:
         - source: filename of the dataset
@@ -69,8 +89,20 @@ class ConfigLoader:
         Used to load and prepare training/test data in ML modules.
         '''
        
-        return {
+        return MappingProxyType({
             "source": self.get_str("DATA", "source"),
-            "features": self.get_list("DATA", "features"),
+            "features": self.get_list("DATA", "features"),  # a list, so df[spec["features"]] selects columns
             "target": self.get_str("DATA", "target")
-        }
+        })
+
+    # Note: these return the shared read-only mappings above, not fresh dicts. Assigning into
+    # the result raises TypeError; copy it first (dict(cfg.get_constraints())) to adjust values.
+
+    def get_constraints(self):
+        return self.constraints
+
+    def get_model_params(self):
+        return self.model_params
+
+    def get_data_spec(self):
+        return self.data_spec
@@ -13,7 +13,7 @@
 
 # (goto Label A)  which is at the very bottom
 # === Optional: Later replace this with AuditLogger.log(...) ===
-# from audit_logger import AuditLogger
+# from core.audit_logger import AuditLogger
 # logger = AuditLogger()
 # logger.log(MODE, condition_type, bin_weights, recent_row.to_dict())
 
@@ -22,20 +22,31 @@
 # - Track performance per bin per regime
 # - Continuously refine model thresholds and logic
 
+import enum
+import hashlib
+import os
+
+import joblib
 import numpy as np
 import pandas as pd
-import json
-
-from datetime import datetime
 
-from config_loader_module import ConfigLoader
+from core.config_loader_module import ConfigLoader
+from core.serialization import dumps_json, iso_utc
 cfg = ConfigLoader()
 
 from sklearn.ensemble import RandomForestClassifier
 
 # === GLOBAL CONSTRAINTS AND SETTINGS ===
 
-MODE = "Manual"  # options: "Manual", "ML enabled", "ML off"
+class Mode(enum.IntEnum):
+    MANUAL = 0
+    ML_ON = 1
+    ML_OFF = 2
+
+MODE_NAMES = ("Manual", "ML enabled", "ML off")  # indexed by Mode; used in output and logs
+_MODE_BY_NAME = {name: Mode(i) for i, name in enumerate(MODE_NAMES)}
+
+MODE = Mode.MANUAL  # options: Mode.MANUAL, Mode.ML_ON, Mode.ML_OFF
 
 constraints = cfg.get_constraints()
 MAX_BIN_WEIGHT = constraints["max_bin_weight"]  # Max % per module (6%)
@@ -51,86 +62,125 @@ reserve = constraints["liquidity_reserve"]
 INNER_BIN_BUFFER = 0.95            # 5% internal buffer: e.g., only 4.75% used if 5% is allocated
 MANUAL_TRADING_ALLOCATION = 0.10   # Max 10% for manual trades
 
-# === Load and preprocess data ===
+MARKET_DATA_CSV = 'market_conditions.csv'  # Data includes SPY, VIX, PE, RSI, etc.
+FEATURE_COLUMNS = ['spy_rsi', 'vix', 'atm_iv', 'pe_ratio', 'fear_greed', 'spx_slope', 'vol_of_vol']
+MODEL_CACHE_DIR = '.cache'
+
+RF_PARAMS = {"n_estimators": 100, "random_state": 42}
+
+
+def load_or_train_model(features, target, csv_path=MARKET_DATA_CSV):
+    # features: 2D float ndarray in FEATURE_COLUMNS order; target: 1D label array
+    # The fitted forest is cached on disk, keyed on the CSV's mtime + size and the RF params,
+    # so reruns against unchanged data skip training entirely.
+    stat = os.stat(csv_path)
+    cache_key = hashlib.sha1(
+        f"{stat.st_mtime_ns}:{stat.st_size}:{sorted(RF_PARAMS.items())}:"
+        f"{FEATURE_COLUMNS}:{features.dtype}".encode()).hexdigest()[:16]
+    model_path = os.path.join(MODEL_CACHE_DIR, f"rf_{cache_key}.joblib")
+
+    if os.path.exists(model_path):
+        return joblib.load(model_path)
 
-market_data = pd.read_csv('market_conditions.csv')  # Data includes SPY, VIX, PE, RSI, etc.
-features = market_data[['spy_rsi', 'vix', 'atm_iv', 'pe_ratio', 'fear_greed', 'spx_slope', 'vol_of_vol']]
-target = market_data['market_label']  # Labels: 1 = Oversold, 0 = Neutral, -1 = Overbought
+    model = RandomForestClassifier(n_jobs=-1, **RF_PARAMS)  # fit trees on all cores
+    model.fit(features, target)
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    joblib.dump(model, model_path, compress=3)
+    return model
 
-# === Train machine learning model (Random Forest Classifier) ===
 
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(features, target)
+def run(mode=MODE):
+    # mode: a Mode, or its legacy name ("Manual", "ML enabled", "ML off")
+    mode = _MODE_BY_NAME[mode] if isinstance(mode, str) else Mode(mode)
 
-# === Manual override logic: define oversold condition categories ===
+    # === Load and preprocess data ===
 
-from bin_logic_shared import categorize_oversold
+    market_data = pd.read_csv(MARKET_DATA_CSV)
+    # Plain float32 arrays (the forest's internal dtype): sklearn skips its own DataFrame
+    # conversion, and mixed-dtype columns can't silently upcast the matrix to object.
+    feat_arr = market_data[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    target = market_data['market_label'].to_numpy()  # Labels: 1 = Oversold, 0 = Neutral, -1 = Overbought
 
-# === Evaluate current market state ===
+    # === Train machine learning model (Random Forest Classifier) ===
 
-recent_row = market_data.iloc[-1]
-# Provide the correct order, and correct names for prediction
-# The reshape command turns the output into a 2D row for the model
-model_input = recent_row[features.columns].values.reshape(1, -1)
+    model = load_or_train_model(feat_arr, target)
 
-# Now we extract the single prediction value ( [0] )
-model_prediction = model.predict(model_input)[0]
+    # === Manual override logic: define oversold condition categories ===
 
-# Choose whether to manually assume oversold conditions,
-# to enable machine learning to test on its own,
-# or to turn off the oversold analysis completely.
+    from bin_logic_shared import categorize_oversold
 
-if MODE == "Manual":
-    condition_type = categorize_oversold(recent_row)
-elif MODE == "ML enabled":
-    if model_prediction == 1:
-        condition_type = "oversold and undervalued"
-    elif model_prediction == -1:
-        condition_type = "technically oversold but overvalued"
-    else:
+    # === Evaluate current market state ===
+
+    # The last row, sliced (not indexed) so it stays a 2D (1, n_features) input for the model
+    model_input = feat_arr[-1:, :]
+
+    # Now we extract the single prediction value ( [0] )
+    model_prediction = int(model.predict(model_input)[0])
+
+    # Choose whether to manually assume oversold conditions,
+    # to enable machine learning to test on its own,
+    # or to turn off the oversold analysis completely.
+
+    if mode is Mode.MANUAL:
+        condition_type = categorize_oversold(market_data.iloc[-1])
+    elif mode is Mode.ML_ON:
+        if model_prediction == 1:
+            condition_type = "oversold and undervalued"
+        elif model_prediction == -1:
+            condition_type = "technically oversold but overvalued"
+        else:
+            condition_type = "not_oversold"
+    elif mode is Mode.ML_OFF:
         condition_type = "not_oversold"
-elif MODE == "ML off":
-    condition_type = "not_oversold"
 
-# === Define bin allocation strategies based on oversold type ===
+    # === Define bin allocation strategies based on oversold type ===
 
-from bin_logic_shared import assign_bin_weights
+    from bin_logic_shared import assign_bin_weights
 
-# Now use the function
-bin_weights = assign_bin_weights(condition_type)
+    # Now use the function
+    bin_weights = assign_bin_weights(condition_type)
 
-# === Final risk normalization (preserve 80% allocation cap) ===
+    # === Final risk normalization (preserve 80% allocation cap) ===
 
-total_alloc = sum(bin_weights.values())
-scaling_factor = constraints["total_portfolio_allocation"] / total_alloc
+    keys = list(bin_weights)
+    vals = np.fromiter((bin_weights[k] for k in keys), dtype=np.float64, count=len(keys))
+    vals *= constraints["total_portfolio_allocation"] / vals.sum()
+    bin_weights = dict(zip(keys, vals.tolist()))  # back to plain floats for printing and the log
 
-for k in bin_weights:
-    bin_weights[k] *= scaling_factor
+    # === Output results ===
 
-# === Output results ===
+    print(f"Current market condition: {condition_type}")
+    print("Proposed bin weight allocation:")
+    for bin_name, weight in bin_weights.items():
+        print(f" - {bin_name}: {weight*100:.2f}%")
 
-print(f"Current market condition: {condition_type}")
-print("Proposed bin weight allocation:")
-for bin_name, weight in bin_weights.items():
-    print(f" - {bin_name}: {weight*100:.2f}%")
+    # === Lightweight JSON audit log ===
 
-# === Lightweight JSON audit log ===
+    log_entry = {
+        "timestamp": iso_utc(),
+        "mode": MODE_NAMES[mode],
+        "condition": condition_type,
+        "bin_count": len(bin_weights),
+        "bin_weights": bin_weights,
+        "constraints": {
+            "max_bin_weight": MAX_BIN_WEIGHT,
+            "min_bin_weight": MIN_BIN_WEIGHT,
+            "total_portfolio_allocation": constraints["total_portfolio_allocation"],
+            "liquidity_reserve": constraints["liquidity_reserve"]
+        }
+    }
+
+    with open("allocation_log.jsonl", "ab") as f:
+        f.write(dumps_json(log_entry, newline=True))
 
-log_entry = {
-    "timestamp": datetime.utcnow().isoformat(),
-    "mode": MODE,
-    "condition": condition_type,
-    "bin_count": len(bin_weights),
-    "bin_weights": bin_weights,
-    "constraints": {
-        "max_bin_weight": MAX_BIN_WEIGHT,
-        "min_bin_weight": MIN_BIN_WEIGHT,
-        "total_portfolio_allocation": constraints["total_portfolio_allocation"],
-        "liquidity_reserve": constraints["liquidity_reserve"]
+    return {
+        "condition": condition_type,
+        "model_prediction": model_prediction,
+        "bin_weights": bin_weights,
     }
-}
 
-with open("allocation_log.jsonl", "a") as f:
-    f.write(json.dumps(log_entry) + "\n")
+
+if __name__ == "__main__":
+    run()
 
 # (Label A)
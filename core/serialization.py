@@ -0,0 +1,47 @@
+# Program: serialization.py
+# Author: Brian Anderson
+# Origin Date: 11May2025
+# Version: 1.0
+#
+# Purpose:
+#    /JSON encoding and UTC timestamps shared by the audit, allocation and compliance logs.
+#    /Import from core.serialization so every package loads the one copy of this module.
+
+import functools
+import json
+import time
+
+# orjson emits JSON bytes in C; stdlib json is the fallback when it isn't installed.
+# The one serializer for the audit, allocation and compliance logs: compact unless indent is set.
+try:
+    import orjson
+
+    def dumps_json(obj, sort_keys=False, indent=False, newline=False):
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+except ImportError:
+    def dumps_json(obj, sort_keys=False, indent=False, newline=False):
+        if indent:
+            text = json.dumps(obj, sort_keys=sort_keys, indent=2)
+        else:
+            text = json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"))
+        return (text + "\n" if newline else text).encode()
+
+# Timestamps: the per-second 'YYYY-MM-DDTHH:MM:SS' prefix is cached, so each event only
+# formats its microsecond tail (and avoids the deprecated datetime.utcnow()).
+@functools.lru_cache(maxsize=2)
+def _format_sec(sec):
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))
+
+def iso_utc(t=None):
+    # t: epoch seconds, default now
+    if t is None:
+        t = time.time()
+    sec = int(t)
+    return f"{_format_sec(sec)}.{int((t - sec) * 1_000_000):06d}Z"
@@ -0,0 +1,38 @@
+# Module: _kernels.py
+# Author: Brian Anderson
+# Origin Date: 11May2025
+# Version: 1.0
+#
+# Purpose:
+#    /Compiled inner loop for the allocation rule driver (rules 1-3 and 5 in one pass).
+#    /numba is optional; without it enforce_core is None and the driver keeps its numpy path.
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _enforce_core(weights, types, max_total, max_bin, futures_code):
+    # weights: float64[:] (updated in place); types: int8[:] BinType codes.
+    # Rules 1 + 2: scale down to max_total. Rule 3: cap each bin at max_bin.
+    # Returns the post-cap futures allocation so the caller can apply rule 5.
+    n = weights.shape[0]
+    total = 0.0
+    for i in range(n):
+        total += weights[i]
+    scale = max_total / total if total > max_total else 1.0
+
+    futures_total = 0.0
+    for i in range(n):
+        w = weights[i] * scale
+        if w > max_bin:
+            w = max_bin
+        weights[i] = w
+        if types[i] == futures_code:
+            futures_total += w
+    return futures_total
+
+
+# fastmath is left off on purpose: these totals are compared against hard risk limits
+enforce_core = njit(cache=True)(_enforce_core) if njit is not None else None
@@ -52,6 +52,15 @@
 ========== END OF RULE LIST ==========
 '''
 
+import math
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+
+import numpy as np
+
+from ._kernels import enforce_core  # None when numba isn't installed
+
 # === CONSTRAINTS (sample values for development) ===
 # These would typically come from config_loader or external config file.
 # Used here as reference for collaborators and context for enforcement logic.
@@ -69,122 +78,210 @@
 
 # all outputs are assumed to return adjusted bin_weights or flag warnings
 
+# Rules 1-3 run on one float64 array of weights (bin order = dict order); the dict is
+# unpacked once on the way in and rebuilt once on the way out.
+
+def _to_array(bin_weights):
+    names = tuple(bin_weights)
+    return names, np.fromiter(bin_weights.values(), dtype=np.float64, count=len(names))
+
+def _scale_to_cap(arr, max_total):
+    # Scale all weights down proportionally, in place, if their total exceeds max_total
+    current_total = arr.sum()
+    if current_total > max_total:
+        arr *= max_total / current_total
+    return arr
+
+def _cap_per_bin(names, arr, max_bin):
+    # Clip each weight to max_bin in place; returns the (bin_name, allocation) pairs that were over.
+    # The over-cap mask is taken before clipping, so no pre-clip copy of the weights is needed.
+    over = arr > max_bin
+    flagged_idx = np.flatnonzero(over)
+    if not flagged_idx.size:
+        return []
+    flagged_bins = list(zip([names[i] for i in flagged_idx], arr[flagged_idx].tolist()))
+    np.copyto(arr, max_bin, where=over)
+    return flagged_bins
+
+# bin_metadata is flattened once per enforcement run into parallel columns indexed by bin
+# position (same order as the weight array), so rules 4-7 and 10 test whole columns
+# instead of probing {bin_name: {...}} twice per bin.
+
+class BinType(IntEnum):
+    UNKNOWN = -1  # no 'type' given, or one the rules don't distinguish
+    EQUITY = 0
+    OPTIONS = 1
+    FUTURES = 2
+
+_BIN_TYPE_BY_NAME = {'equity': BinType.EQUITY, 'options': BinType.OPTIONS, 'futures': BinType.FUTURES}
+
+@dataclass(slots=True)
+class BinMetadataTable:
+    names: tuple
+    index: dict              # bin_name -> position
+    types: np.ndarray        # int8 BinType codes
+    underlyings: np.ndarray  # object: underlying symbol, or None if not given
+    margin_mult: np.ndarray  # float64, 1.0 if not given
+    models: np.ndarray       # object: assigned model name, or None
+    futures_idx: np.ndarray  # intp positions of futures bins, for rule 5
+    options_idx: np.ndarray  # intp positions of options bins, for rule 7
+
+    @classmethod
+    def build(cls, names, bin_metadata):
+        metas = [bin_metadata.get(name, {}) for name in names]
+        n = len(names)
+        types = np.fromiter((_BIN_TYPE_BY_NAME.get(m.get('type'), BinType.UNKNOWN) for m in metas),
+                            dtype=np.int8, count=n)
+        underlyings = np.empty(n, dtype=object)
+        models = np.empty(n, dtype=object)
+        underlyings[:] = [m.get('underlying') for m in metas]
+        models[:] = [m.get('model') for m in metas]
+        margin_mult = np.fromiter((m.get('margin_mult', 1.0) for m in metas), dtype=np.float64, count=n)
+        return cls(tuple(names), {name: i for i, name in enumerate(names)},
+                   types, underlyings, margin_mult, models,
+                   np.flatnonzero(types == BinType.FUTURES), np.flatnonzero(types == BinType.OPTIONS))
+
+# The dict-level rule 1/2 functions return bin_weights itself when it is already within the
+# cap, and otherwise a new scaled dict (built by one comprehension) without mutating the input.
+
+def _scaled_dict(bin_weights, max_total):
+    current_total = math.fsum(bin_weights.values())  # exactly rounded, so the cap isn't missed by drift
+    if current_total > max_total:
+        scaling_factor = max_total / current_total
+        return {k: v * scaling_factor for k, v in bin_weights.items()}
+    return bin_weights
+
 # === With respect to rule number One ===
 
 def enforce_liquidity_reserve_only(bin_weights, constraints):
-    '''Rule 1 only: enforce 10% liquidity reserve'''
-    liquidity_reserve = constraints['liquidity_reserve']
-    max_total_allowed = 1.0 - liquidity_reserve
-    current_total = sum(bin_weights.values())
-
-    if current_total > max_total_allowed:
-        scaling_factor = max_total_allowed / current_total
-        for bin_name in bin_weights:
-            bin_weights[bin_name] *= scaling_factor
-
-    return bin_weights
+    '''Rule 1 only: enforce 10% liquidity reserve (the driver uses enforce_reserves)'''
+    return _scaled_dict(bin_weights, 1.0 - constraints['liquidity_reserve'])
 
 # === With respect to rule number Two ===
 
 def enforce_manual_reserve_only(bin_weights, constraints):
-    '''Rule 2 only: reserve space for manual trading (typically 10%)'''
-    manual_reserve = constraints['manual_trading_allocation']
-    max_auto_alloc = 1.0 - manual_reserve
-    current_total = sum(bin_weights.values())
+    '''Rule 2 only: reserve space for manual trading (typically 10%) (the driver uses enforce_reserves)'''
+    return _scaled_dict(bin_weights, 1.0 - constraints['manual_trading_allocation'])
 
-    if current_total > max_auto_alloc:
-        scaling_factor = max_auto_alloc / current_total
-        for bin_name in bin_weights:
-            bin_weights[bin_name] *= scaling_factor
+# === Rules One and Two, fused (production driver path) ===
 
-    return bin_weights
+def _reserve_cap(constraints):
+    # Both reserves are held at once, so automated bins get what is left after both
+    return 1.0 - constraints['liquidity_reserve'] - constraints['manual_trading_allocation']
+
+def enforce_reserves(bin_weights, constraints):
+    '''Rules 1 + 2: one sum, one scale against the combined liquidity + manual reserve'''
+    return _scaled_dict(bin_weights, _reserve_cap(constraints))
 
 # === With respect to rule number Three ===
 
 def enforce_per_bin_maximum(bin_weights, constraints):
     '''Rule 3 enforcement: enforce a per-bin maximum allocation'''
-    max_bin = constraints['max_bin_weight']
-    flagged_bins = []
-
-    for bin_name, allocation in bin_weights.items():
-        if allocation > max_bin:
-            flagged_bins.append((bin_name, allocation))
-            bin_weights[bin_name] = max_bin  # Cap it to the maximum
-
+    names, arr = _to_array(bin_weights)
+    flagged_bins = _cap_per_bin(names, arr, constraints['max_bin_weight'])  # Cap to the maximum
+    bin_weights.update(zip(names, arr.tolist()))
     return bin_weights, flagged_bins
 
 # === With respect to rule number Four ===
 
-def enforce_bin_count_and_overlap(bin_weights, bin_metadata):
+def enforce_bin_count_and_overlap(table):
     '''Rule 4: cap number of bins and enforce unique underlying spread'''
     max_bins_allowed = 25
     overlap_threshold = 20  # Penalty if overlap detected above this
 
-    active_bins = list(bin_weights.keys())
-    underlyings = []
-    for bin_name in active_bins:
-        if 'underlying' in bin_metadata.get(bin_name, {}):
-            underlyings.append(bin_metadata[bin_name]['underlying'])
-
-    unique_underlyings = set(underlyings)
-
-    if len(active_bins) > max_bins_allowed:
+    active_count = len(table.names)
+    if active_count > max_bins_allowed:
         return False, 'too many bins active'
-    if len(unique_underlyings) < len(active_bins) and len(active_bins) > overlap_threshold:
+
+    # Overlap = a repeated underlying among the bins that declare one; bins without
+    # an underlying neither overlap nor count against the unique total.
+    underlyings = table.underlyings[np.not_equal(table.underlyings, None)]
+    if active_count > overlap_threshold and np.unique(underlyings).size < underlyings.size:
         return False, 'bin overlap exceeds threshold'
 
     return True, None
 
 # === With respect to rule number Five ===
 
-def enforce_futures_allocation(bin_weights, bin_metadata):
-    '''Rule 5: limit total exposure to futures strategies'''
-    max_futures_alloc = 0.05
-    max_margin_used = 0.0375
-    total_futures_alloc = 0.0
-
-    for bin_name, allocation in bin_weights.items():
-        bin_type = bin_metadata.get(bin_name, {}).get('type', None)
-        if bin_type == 'futures':
-            total_futures_alloc += allocation
+MAX_FUTURES_ALLOC = 0.05
 
-    if total_futures_alloc > max_futures_alloc:
+def _check_futures_total(total_futures_alloc):
+    if total_futures_alloc > MAX_FUTURES_ALLOC:
         return False, 'futures allocation exceeds maximum permitted exposure'
-
     return True, None
 
-# Enforcement driver function (placeholder)
-# Calls individual rule enforcement in sequence
+def enforce_futures_allocation(weights, table):
+    '''Rule 5: limit total exposure to futures strategies'''
+    max_margin_used = 0.0375
 
-def enforce_allocation_rules(bin_weights, constraints, bin_metadata):
-    bin_weights = enforce_liquidity_reserve_only(bin_weights, constraints)
-    bin_weights = enforce_manual_reserve_only(bin_weights, constraints)
-    bin_weights, over_caps = enforce_per_bin_maximum(bin_weights, constraints)
+    return _check_futures_total(float(weights[table.futures_idx].sum()))
 
-    ok, reason = enforce_bin_count_and_overlap(bin_weights, bin_metadata)
+# Enforcement driver function (placeholder)
+# Calls individual rule enforcement in sequence
+#
+# Backtests re-evaluate the same weights/constraints/metadata bar after bar, so the rule
+# pipeline is a pure function of a hashable snapshot of its inputs and is memoized.
+# The snapshot is taken by content (not object identity), so callers may freely mutate
+# and reuse their dicts without ever getting a stale result.
+
+@lru_cache(maxsize=4096)
+def _enforce_impl(frozen_weights, constraints_key, metadata_key):
+    # frozen_weights: ((bin_name, weight), ...); constraints_key: sorted constraint items;
+    # metadata_key: ((bin_name, type, underlying), ...) in weight order.
+    # Returns (violation message or None, adjusted weights tuple).
+    names = tuple(name for name, _ in frozen_weights)
+    arr = np.fromiter((w for _, w in frozen_weights), dtype=np.float64, count=len(names))
+    constraints = dict(constraints_key)
+    table = BinMetadataTable.build(
+        names, {name: {'type': t, 'underlying': u} for name, t, u in metadata_key})
+
+    # Rule 4 depends only on which bins are active, so it fails fast before any scaling work
+    ok, reason = enforce_bin_count_and_overlap(table)
     if not ok:
-        raise ValueError(f"Bin overlap violation: {reason}")
-
-    ok, reason = enforce_futures_allocation(bin_weights, bin_metadata)
+        return f"Bin overlap violation: {reason}", None
+
+    # Rule 5 is judged on the scaled and capped weights, so it has to follow rules 1-3
+    if enforce_core is not None:
+        # Compiled single pass over the weights: rules 1 + 2, rule 3, and the futures total
+        futures_total = enforce_core(arr, table.types, _reserve_cap(constraints),
+                                     float(constraints['max_bin_weight']), int(BinType.FUTURES))
+        ok, reason = _check_futures_total(futures_total)
+    else:
+        # Rules 1-3 on the array form; the weights stay in one ndarray across all three
+        _scale_to_cap(arr, _reserve_cap(constraints))  # rules 1 + 2 in a single pass
+        _cap_per_bin(names, arr, constraints['max_bin_weight'])
+        ok, reason = enforce_futures_allocation(arr, table)
     if not ok:
-        raise ValueError(f"Futures exposure violation: {reason}")
+        return f"Futures exposure violation: {reason}", None
 
+    return None, tuple(arr.tolist())
+
+def enforce_allocation_rules(bin_weights, constraints, bin_metadata):
+    frozen_weights = tuple(bin_weights.items())
+    metadata_key = tuple(
+        (name, meta.get('type'), meta.get('underlying'))
+        for name, meta in ((name, bin_metadata.get(name, {})) for name in bin_weights))
+    key = (frozen_weights, tuple(sorted(constraints.items())), metadata_key)
+    try:
+        hash(key)
+    except TypeError:  # an unhashable value (e.g. a list) can't key the cache; evaluate uncached
+        violation, weights = _enforce_impl.__wrapped__(*key)
+    else:
+        violation, weights = _enforce_impl(*key)
+    if violation:
+        raise ValueError(violation)
+
+    bin_weights.update(zip(bin_weights, weights))
     return bin_weights  # final output with all limits applied
 
 # === PROCEED WITH RULES SIX THROUGH ELEVEN AS FOLLOWS ===
 
 # === With respect to rule Six ===
 
-def enforce_margin_multiplier(bin_weights, bin_metadata, constraints):
+def enforce_margin_multiplier(weights, table, constraints):
     '''Estimate margin exposure using each strategy's leverage multiplier'''
-    total_margin_used = 0.0
-    margin_threshold = 1.0 - constraints['liquidity_reserve'] - constraints['manual_trading_allocation']
-
-    for bin_name, alloc in bin_weights.items():
-        metadata = bin_metadata.get(bin_name, {})
-        multiplier = metadata.get('margin_mult', 1.0)
-        margin_used = alloc * multiplier
-        total_margin_used += margin_used
+    margin_threshold = _reserve_cap(constraints)
+    total_margin_used = float(weights @ table.margin_mult)
 
     if total_margin_used > margin_threshold:
         return False, f"Estimated margin usage {total_margin_used:.2%} exceeds threshold {margin_threshold:.2%}"
@@ -192,14 +289,10 @@ def enforce_margin_multiplier(bin_weights, bin_metadata, constraints):
 
 # === With respect to rule Seven ===
 
-def enforce_slippage_buffer(bin_weights, bin_metadata, constraints):
+def enforce_slippage_buffer(table, constraints):
     '''Estimate total slippage impact for option bins'''
     slippage_per_option_bin = 0.015  # 1.5%
-    estimated_slip = 0.0
-
-    for bin_name in bin_weights:
-        if bin_metadata.get(bin_name, {}).get('type') == 'options':
-            estimated_slip += slippage_per_option_bin
+    estimated_slip = table.options_idx.size * slippage_per_option_bin
 
     if estimated_slip > constraints.get('slippage_budget', 0.05):
         return False, f"Slippage risk exceeds buffer: {estimated_slip:.2%}"
@@ -227,30 +320,38 @@ def enforce_nightly_rebalance(bin_status_log):
 
 # === With respect to rule Ten ===
 
-def enforce_fixed_bin_model_mapping(bin_metadata, fixed_assignments):
+def enforce_fixed_bin_model_mapping(table, fixed_assignments):
     '''Each bin must retain its original model identity'''
-    for bin_name, meta in bin_metadata.items():
-        expected_model = fixed_assignments.get(bin_name)
-        actual_model = meta.get('model')
-        if actual_model != expected_model:
+    # Checks the bins in table; build it over tuple(bin_metadata) to cover every known bin
+    current = dict(zip(table.names, table.models.tolist()))
+    if current == fixed_assignments:  # common case: nothing reassigned, one C-level compare
+        return True, None
+    for bin_name, actual_model in current.items():  # find the first offender to report
+        if actual_model != fixed_assignments.get(bin_name):
             return False, f"Bin {bin_name} assigned to unexpected model: {actual_model}"
     return True, None
 
 # === With respect to rule Eleven ===
 
+# Alert levels as small ints indexing ALERT_REQUIRED_DAYS; level 0 (green, or anything
+# unrecognised) has no minimum persistence.
+ALERT_LEVELS = ('green', 'yellow', 'red')
+ALERT_REQUIRED_DAYS = np.array([0, 1, 2], dtype=np.int64)
+_ALERT_LEVEL_CODE = {'yellow': 1, 'red': 2}
+
 def enforce_warning_persistence(bin_alert_state, today_date):
     '''Ensure RED/YELLOW states persist for a minimum period'''
-    required_persistence = {
-        'red': 2,
-        'yellow': 1
-    }
-
-    for bin_name, alert in bin_alert_state.items():
-        level = alert.get('level')
-        date_set = alert.get('since')
-        days_elapsed = (today_date - date_set).days
-        if level in required_persistence and days_elapsed < required_persistence[level]:
-            return False, f"Bin {bin_name} must remain {level.upper()} for {required_persistence[level]} days"
+    names = tuple(bin_alert_state)
+    alerts = bin_alert_state.values()
+    levels = np.fromiter((_ALERT_LEVEL_CODE.get(a.get('level'), 0) for a in alerts), dtype=np.int8, count=len(names))
+    since = np.array([a.get('since') for a in alerts], dtype='datetime64[us]')
+
+    # Whole days elapsed, floored like timedelta.days
+    elapsed = (np.datetime64(today_date, 'us') - since) // np.timedelta64(1, 'D')
+    bad = np.flatnonzero((levels > 0) & (elapsed < ALERT_REQUIRED_DAYS[levels]))
+    if bad.size:
+        i = bad[0]
+        return False, f"Bin {names[i]} must remain {ALERT_LEVELS[levels[i]].upper()} for {ALERT_REQUIRED_DAYS[levels[i]]} days"
     return True, None
 
 # Note: There may be need, here, to collectively activate some mechanic of rules six through eleven.  Review them to be sure.
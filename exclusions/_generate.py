@@ -0,0 +1,126 @@
+# Module: _generate.py
+# Author: Brian Anderson
+# Origin Date: 30April2025
+# Version: 1.0
+#
+# Purpose:
+#    /Writes the year modules (exclusions_20XX.py) from their date tables in exclusions/data/.
+#    /The tables are the only hand-maintained part; every year module is emitted from the same
+#    /template, so years can't drift apart, and the dates import as plain literals.
+#
+# Usage (from the repository root):
+#    python -m exclusions._generate            # every data/<year>.csv
+#    python -m exclusions._generate 2021 2022  # selected years
+#
+# data/<year>.csv has an "event,date" header and one ISO date per row. Lines starting with '#'
+# are notes, copied into the module below the dates.
+
+import csv
+import sys
+from datetime import date
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / "data"
+OUT_DIR = Path(__file__).parent
+
+# event -> (list name prefix, comment above the list, ExclusionCalendar field), in module order
+EVENT_LISTS = {
+    "cpi": ("Date_CPI_Releases", "CPI release dates for {year}", "cpi"),
+    "fomc": ("Date_FOMC_Announcements", "FOMC announcement dates for {year}", "fomc"),
+    "powell": ("Date_Powell_Speeches", "Powell speeches in {year} (partial list)", "powell"),
+    "half_day": ("Date_Market_HalfDays", "Market half-days in {year}", "half_days"),
+    "last_trading": ("Date_Last_Trading_Days", "Last trading day of each month in {year}", "last_trading_days"),
+    "quad_witching": ("Date_Quad_Witching", "Quad Witching Dates {year}", "quad_witching"),
+    "nfp": ("Date_NFP", "NFP Fridays {year} (1st Friday each month approx.)", "nfp"),
+}
+ELECTION = "election"  # at most one row; the module gets Date_Election_<year> = None without it
+
+DATES_PER_LINE = 4
+
+HEADER = """\
+# Program: exclusions_{year}.py
+# Author: Brian Anderson
+# Origin Date: 30April2025
+# Version: 1.0
+#
+# Purpose:
+#    /Backtest exclusion criterion for the year of {year}
+#    /Assemble market dates for critical days that most strongly affect market activity.
+#    /Specifies spans of time for which alteration of trading activity should be considered.
+#
+# Generated by _generate.py from data/{year}.csv; edit the table and regenerate, not this file.
+
+from datetime import datetime
+
+from .exclusion_calendar import ExclusionCalendar
+"""
+
+FUNCTIONS = ("event_flags", "is_valid_trading_day", "exit_time_on_fomc_day", "exit_time_on_half_day",
+             "powell_speech_blackout", "quad_witching_exit_time", "nfp_trading_restrictions",
+             "election_day_halt")
+
+
+def read_table(path):
+    '''Returns ({event: [date, ...]}, [note line, ...]) for one data/<year>.csv'''
+    with open(path, newline="", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    notes = [line for line in lines if line.startswith("#")]
+    events = {}
+    for row in csv.DictReader(line for line in lines if line and not line.startswith("#")):
+        event = row["event"].strip()
+        if event != ELECTION and event not in EVENT_LISTS:
+            raise ValueError(f"{path.name}: unknown event {event!r}")
+        events.setdefault(event, []).append(date.fromisoformat(row["date"].strip()))
+    if len(events.get(ELECTION, ())) > 1:
+        raise ValueError(f"{path.name}: more than one election date")
+    return events, notes
+
+
+def _datetime_literal(d):
+    return f"datetime({d.year}, {d.month}, {d.day})"
+
+
+def render_module(year, events, notes):
+    out = [HEADER.format(year=year)]
+    for event, (prefix, comment, _) in EVENT_LISTS.items():
+        dates = sorted(events.get(event, ()))
+        rows = [", ".join(_datetime_literal(d) for d in dates[i:i + DATES_PER_LINE])
+                for i in range(0, len(dates), DATES_PER_LINE)]
+        body = ",\n".join(f"    {row}" for row in rows)
+        out.append(f"# {comment.format(year=year)}\n{prefix}_{year} = [\n{body}\n]\n" if rows
+                   else f"# {comment.format(year=year)}\n{prefix}_{year} = []\n")
+
+    election = events.get(ELECTION)
+    if election:
+        out.append(f"# Election Day {year}\nDate_Election_{year} = {_datetime_literal(election[0])}\n")
+    else:
+        out.append(f"# Election Day (not applicable in {year})\nDate_Election_{year} = None\n")
+
+    if notes:
+        out.append("\n".join(notes) + "\n")
+
+    fields = "".join(f"    {field}={prefix}_{year},\n" for prefix, _, field in EVENT_LISTS.values())
+    out.append(
+        "# All checks for the year come from one shared ExclusionCalendar (see exclusion_calendar.py)\n"
+        f"calendar_{year} = ExclusionCalendar(\n"
+        f"    {year},\n"
+        f"{fields}"
+        f"    election=Date_Election_{year},\n"
+        ")\n")
+    out.append(f"exclusion_dates = calendar_{year}.exclusion_dates\n" +
+               "".join(f"{name} = calendar_{year}.{name}\n" for name in FUNCTIONS))
+    return "\n".join(out)
+
+
+def generate(years=None):
+    paths = sorted(DATA_DIR.glob("*.csv")) if not years else [DATA_DIR / f"{y}.csv" for y in years]
+    for path in paths:
+        year = int(path.stem)
+        events, notes = read_table(path)
+        target = OUT_DIR / f"exclusions_{year}.py"
+        target.write_text(render_module(year, events, notes), encoding="utf-8")
+        print(f"wrote {target.name}")
+
+
+if __name__ == "__main__":
+    generate(sys.argv[1:])
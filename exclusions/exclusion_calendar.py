@@ -0,0 +1,110 @@
+# Module: exclusion_calendar.py
+# Author: Brian Anderson
+# Origin Date: 30April2025
+# Version: 1.0
+#
+# Purpose:
+#    /One implementation of the yearly exclusion checks. A year module (exclusions_20XX.py)
+#    /lists its dates and builds an ExclusionCalendar from them; the query functions it exports
+#    /are that calendar's methods, so a fix here applies to every year at once.
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import time, timedelta
+
+# Event bits: every event day maps to the OR of the events that fall on it, so each check
+# below is one dict probe, and "is this day special at all?" is a single nonzero test
+EVENT_FOMC = 1
+EVENT_HALF_DAY = 2
+EVENT_POWELL = 4
+EVENT_QUAD = 8
+EVENT_NFP = 16
+EVENT_NFP_PREV = 32  # the day before an NFP release
+EVENT_ELECTION = 64
+EVENT_EXCLUDED = 128  # any listed exclusion day (CPI, FOMC, Powell, half day, last trading day)
+
+# 7:00 AM on the following day (timedelta rolls over month and year ends)
+def _next_day_7am(date):
+    return (date + timedelta(days=1)).replace(hour=7, minute=0, second=0, microsecond=0)
+
+@dataclass(frozen=True, slots=True)
+class ExclusionCalendar:
+    year: int
+    cpi: tuple = ()                # datetimes, as listed in the year module
+    fomc: tuple = ()
+    powell: tuple = ()
+    half_days: tuple = ()
+    last_trading_days: tuple = ()
+    quad_witching: tuple = ()
+    nfp: tuple = ()
+    election: object = None        # datetime, or None in non-election years
+    exclusion_dates: frozenset = field(init=False)
+    events: dict = field(init=False)  # date -> EVENT_* bits
+
+    def __post_init__(self):
+        # Combine all exclusion dates into a set for faster lookup
+        object.__setattr__(self, 'exclusion_dates', frozenset(
+            [*self.cpi, *self.fomc, *self.powell, *self.half_days, *self.last_trading_days]))
+
+        events = defaultdict(int)
+        for bit, dates in ((EVENT_FOMC, self.fomc),
+                           (EVENT_HALF_DAY, self.half_days),
+                           (EVENT_POWELL, self.powell),
+                           (EVENT_QUAD, self.quad_witching),
+                           (EVENT_NFP, self.nfp)):
+            for d in dates:
+                events[d.date()] |= bit
+        for d in self.nfp:
+            events[(d - timedelta(days=1)).date()] |= EVENT_NFP_PREV
+        for d in self.exclusion_dates:
+            events[d.date()] |= EVENT_EXCLUDED
+        if self.election:
+            events[self.election.date()] |= EVENT_ELECTION
+        object.__setattr__(self, 'events', dict(events))
+
+    # Event bits for the calendar day of date (0 on ordinary days)
+    def event_flags(self, date):
+        return self.events.get(date.date(), 0)
+
+    # Function to filter out exclusion dates (by calendar day, so intraday times on an excluded day fail too)
+    def is_valid_trading_day(self, date):
+        return not self.events.get(date.date(), 0) & EVENT_EXCLUDED
+
+    # Function to determine if trades should be exited early on FOMC days
+    def exit_time_on_fomc_day(self, date):
+        if self.events.get(date.date(), 0) & EVENT_FOMC:
+            return (time(13, 45), time(18, 0))
+        return None
+
+    # Function to determine if it's a market half-day and when trades should be exited
+    def exit_time_on_half_day(self, date):
+        if self.events.get(date.date(), 0) & EVENT_HALF_DAY:
+            return (time(11, 45), _next_day_7am(date))
+        return None
+
+    # Function for Powell speech day trade halt
+    def powell_speech_blackout(self, date):
+        if self.events.get(date.date(), 0) & EVENT_POWELL:
+            return (time(14, 15), time(18, 0))
+        return None
+
+    # Function for quad witching day early exit
+    def quad_witching_exit_time(self, date):
+        if self.events.get(date.date(), 0) & EVENT_QUAD:
+            return (time(13, 0), _next_day_7am(date))
+        return None
+
+    # Function for NFP timing restrictions
+    def nfp_trading_restrictions(self, date):
+        flags = self.events.get(date.date(), 0)
+        if flags & EVENT_NFP:
+            return (None, time(10, 30))
+        if flags & EVENT_NFP_PREV:
+            return (time(15, 15), None)
+        return None
+
+    # Function for election day full halt
+    def election_day_halt(self, date):
+        if self.events.get(date.date(), 0) & EVENT_ELECTION:
+            return (None, _next_day_7am(date))
+        return None
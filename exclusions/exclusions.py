@@ -0,0 +1,72 @@
+# Program: exclusions.py
+# Author: Brian Anderson
+# Origin Date: 30April2025
+# Version: 1.0
+#
+# Purpose:
+#    /Single year-keyed lookup for the backtest exclusion calendars.
+#    /Every year module (exclusions_20XX.py) builds an ExclusionCalendar; they are gathered here by year,
+#    /so callers no longer import a year-specific module; the query functions dispatch on date.year.
+
+import numpy as np
+
+from . import exclusions_2019, exclusions_2020, exclusions_2021, exclusions_2022
+
+# Year -> that year's ExclusionCalendar (exclusion_calendar.py)
+CALENDARS = {
+    2019: exclusions_2019.calendar_2019,
+    2020: exclusions_2020.calendar_2020,
+    2021: exclusions_2021.calendar_2021,
+    2022: exclusions_2022.calendar_2022,
+}
+
+# Every exclusion day across all years, sorted, for vectorized batch queries
+_EXCL_ARR = np.array(
+    sorted({d.date() for calendar in CALENDARS.values() for d in calendar.exclusion_dates}),
+    dtype='datetime64[D]')
+
+
+def _calendar_for(date):
+    calendar = CALENDARS.get(date.year)
+    if calendar is None:
+        raise ValueError(f"No exclusion calendar for {date.year} (available: {min(CALENDARS)}-{max(CALENDARS)})")
+    return calendar
+
+
+# Function to filter out exclusion dates (by calendar day)
+def is_valid_trading_day(date):
+    return _calendar_for(date).is_valid_trading_day(date)
+
+# Batched form for backtests: dates is any array convertible to datetime64 (e.g. a bar index).
+# Matching is by calendar day, like is_valid_trading_day.
+def is_valid_trading_day_batch(dates):
+    days = np.asarray(dates).astype('datetime64[D]')
+    years = np.unique(days.astype('datetime64[Y]').astype(np.int64) + 1970)
+    missing = [int(y) for y in years if y not in CALENDARS]
+    if missing:
+        raise ValueError(f"No exclusion calendar for {missing} (available: {min(CALENDARS)}-{max(CALENDARS)})")
+    return ~np.isin(days, _EXCL_ARR)
+
+# Function to determine if trades should be exited early on FOMC days
+def exit_time_on_fomc_day(date):
+    return _calendar_for(date).exit_time_on_fomc_day(date)
+
+# Function to determine if it's a market half-day and when trades should be exited
+def exit_time_on_half_day(date):
+    return _calendar_for(date).exit_time_on_half_day(date)
+
+# Function for Powell speech day trade halt
+def powell_speech_blackout(date):
+    return _calendar_for(date).powell_speech_blackout(date)
+
+# Function for quad witching day early exit
+def quad_witching_exit_time(date):
+    return _calendar_for(date).quad_witching_exit_time(date)
+
+# Function for NFP timing restrictions
+def nfp_trading_restrictions(date):
+    return _calendar_for(date).nfp_trading_restrictions(date)
+
+# Function for election day full halt
+def election_day_halt(date):
+    return _calendar_for(date).election_day_halt(date)
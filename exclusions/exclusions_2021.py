@@ -2,13 +2,17 @@
 # Author: Brian Anderson
 # Origin Date: 30April2025
 # Version: 1.0
-# 
+#
 # Purpose:
 #    /Backtest exclusion criterion for the year of 2021
 #    /Assemble market dates for critical days that most strongly affect market activity.
 #    /Specifies spans of time for which alteration of trading activity should be considered.
+#
+# Generated by _generate.py from data/2021.csv; edit the table and regenerate, not this file.
 
-from datetime import datetime, time
+from datetime import datetime
+
+from .exclusion_calendar import ExclusionCalendar
 
 # CPI release dates for 2021
 Date_CPI_Releases_2021 = [
@@ -59,58 +63,25 @@ Date_Election_2021 = None
 # Jackson Hole 2021 note (no action taken)
 # Jackson Hole 2021 occurred around August 26–28
 
-# Combine all exclusion dates into a set for faster lookup
-exclusion_dates = set(
-    Date_CPI_Releases_2021 +
-    Date_FOMC_Announcements_2021 +
-    Date_Powell_Speeches_2021 +
-    Date_Market_HalfDays_2021 +
-    Date_Last_Trading_Days_2021
+# All checks for the year come from one shared ExclusionCalendar (see exclusion_calendar.py)
+calendar_2021 = ExclusionCalendar(
+    2021,
+    cpi=Date_CPI_Releases_2021,
+    fomc=Date_FOMC_Announcements_2021,
+    powell=Date_Powell_Speeches_2021,
+    half_days=Date_Market_HalfDays_2021,
+    last_trading_days=Date_Last_Trading_Days_2021,
+    quad_witching=Date_Quad_Witching_2021,
+    nfp=Date_NFP_2021,
+    election=Date_Election_2021,
 )
 
-# Function to filter out exclusion dates
-def is_valid_trading_day(date):
-    return date not in exclusion_dates
-
-# Function to determine if trades should be exited early on FOMC days
-def exit_time_on_fomc_day(date):
-    fomc_dates_only = {d.date() for d in Date_FOMC_Announcements_2021}
-    if date.date() in fomc_dates_only:
-        return (time(13, 45), time(18, 0))
-    return None
-
-# Function to determine if it's a market half-day and when trades should be exited
-def exit_time_on_half_day(date):
-    half_day_dates_only = {d.date() for d in Date_Market_HalfDays_2021}
-    if date.date() in half_day_dates_only:
-        return (time(11, 45), datetime(date.year, date.month, date.day + 1, 7, 0))
-    return None
-
-# Function for Powell speech day trade halt
-def powell_speech_blackout(date):
-    powell_dates_only = {d.date() for d in Date_Powell_Speeches_2021}
-    if date.date() in powell_dates_only:
-        return (time(14, 15), time(18, 0))
-    return None
-
-# Function for quad witching day early exit
-def quad_witching_exit_time(date):
-    quad_dates_only = {d.date() for d in Date_Quad_Witching_2021}
-    if date.date() in quad_dates_only:
-        return (time(13, 0), datetime(date.year, date.month, date.day + 1, 7, 0))
-    return None
-
-# Function for NFP timing restrictions
-def nfp_trading_restrictions(date):
-    nfp_dates_only = {d.date() for d in Date_NFP_2021}
-    if date.date() in nfp_dates_only:
-        return (None, time(10, 30))
-    elif any((date - d).days == -1 for d in Date_NFP_2021):
-        return (time(15, 15), None)
-    return None
-
-# Function for election day full halt
-def election_day_halt(date):
-    if Date_Election_2021 and date.date() == Date_Election_2021.date():
-        return (None, datetime(date.year, date.month, date.day + 1, 7, 0))
-    return None
+exclusion_dates = calendar_2021.exclusion_dates
+event_flags = calendar_2021.event_flags
+is_valid_trading_day = calendar_2021.is_valid_trading_day
+exit_time_on_fomc_day = calendar_2021.exit_time_on_fomc_day
+exit_time_on_half_day = calendar_2021.exit_time_on_half_day
+powell_speech_blackout = calendar_2021.powell_speech_blackout
+quad_witching_exit_time = calendar_2021.quad_witching_exit_time
+nfp_trading_restrictions = calendar_2021.nfp_trading_restrictions
+election_day_halt = calendar_2021.election_day_halt
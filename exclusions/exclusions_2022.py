@@ -2,15 +2,17 @@
 # Author: Brian Anderson
 # Origin Date: 30April2025
 # Version: 1.0
-# 
+#
 # Purpose:
 #    /Backtest exclusion criterion for the year of 2022
 #    /Assemble market dates for critical days that most strongly affect market activity.
 #    /Specifies spans of time for which alteration of trading activity should be considered.
-#    /For example, since FOMC meetings are released around 2:30 pm, we make choices at 1:45 pm,
-#    /as to whether to withdraw trades, or make other actions (todo).
+#
+# Generated by _generate.py from data/2022.csv; edit the table and regenerate, not this file.
 
-from datetime import datetime, time
+from datetime import datetime
+
+from .exclusion_calendar import ExclusionCalendar
 
 # CPI release dates for 2022
 Date_CPI_Releases_2022 = [
@@ -58,61 +60,30 @@ Date_NFP_2022 = [
 # Election Day 2022
 Date_Election_2022 = datetime(2022, 11, 8)
 
+# For example, since FOMC meetings are released around 2:30 pm, we make choices at 1:45 pm,
+# as to whether to withdraw trades, or make other actions (todo).
 # Jackson Hole 2022 note (no action taken)
 # Jackson Hole 2022 occurred around August 25–27
 
-# Combine all exclusion dates into a set for faster lookup
-exclusion_dates = set(
-    Date_CPI_Releases_2022 +
-    Date_FOMC_Announcements_2022 +
-    Date_Powell_Speeches_2022 +
-    Date_Market_HalfDays_2022 +
-    Date_Last_Trading_Days_2022
+# All checks for the year come from one shared ExclusionCalendar (see exclusion_calendar.py)
+calendar_2022 = ExclusionCalendar(
+    2022,
+    cpi=Date_CPI_Releases_2022,
+    fomc=Date_FOMC_Announcements_2022,
+    powell=Date_Powell_Speeches_2022,
+    half_days=Date_Market_HalfDays_2022,
+    last_trading_days=Date_Last_Trading_Days_2022,
+    quad_witching=Date_Quad_Witching_2022,
+    nfp=Date_NFP_2022,
+    election=Date_Election_2022,
 )
 
-# Function to filter out exclusion dates
-def is_valid_trading_day(date):
-    return date not in exclusion_dates
-
-# Function to determine if trades should be exited early on FOMC days
-def exit_time_on_fomc_day(date):
-    fomc_dates_only = {d.date() for d in Date_FOMC_Announcements_2022}
-    if date.date() in fomc_dates_only:
-        return (time(13, 45), time(18, 0))
-    return None
-
-# Function to determine if it's a market half-day and when trades should be exited
-def exit_time_on_half_day(date):
-    half_day_dates_only = {d.date() for d in Date_Market_HalfDays_2022}
-    if date.date() in half_day_dates_only:
-        return (time(11, 45), datetime(date.year, date.month, date.day + 1, 7, 0))
-    return None
-
-# Function for Powell speech day trade halt
-def powell_speech_blackout(date):
-    powell_dates_only = {d.date() for d in Date_Powell_Speeches_2022}
-    if date.date() in powell_dates_only:
-        return (time(14, 15), time(18, 0))
-    return None
-
-# Function for quad witching day early exit
-def quad_witching_exit_time(date):
-    quad_dates_only = {d.date() for d in Date_Quad_Witching_2022}
-    if date.date() in quad_dates_only:
-        return (time(13, 0), datetime(date.year, date.month, date.day + 1, 7, 0))
-    return None
-
-# Function for NFP timing restrictions
-def nfp_trading_restrictions(date):
-    nfp_dates_only = {d.date() for d in Date_NFP_2022}
-    if date.date() in nfp_dates_only:
-        return (None, time(10, 30))
-    elif any((date - d).days == -1 for d in Date_NFP_2022):
-        return (time(15, 15), None)
-    return None
-
-# Function for election day full halt
-def election_day_halt(date):
-    if date.date() == Date_Election_2022.date():
-        return (None, datetime(date.year, date.month, date.day + 1, 7, 0))
-    return None
+exclusion_dates = calendar_2022.exclusion_dates
+event_flags = calendar_2022.event_flags
+is_valid_trading_day = calendar_2022.is_valid_trading_day
+exit_time_on_fomc_day = calendar_2022.exit_time_on_fomc_day
+exit_time_on_half_day = calendar_2022.exit_time_on_half_day
+powell_speech_blackout = calendar_2022.powell_speech_blackout
+quad_witching_exit_time = calendar_2022.quad_witching_exit_time
+nfp_trading_restrictions = calendar_2022.nfp_trading_restrictions
+election_day_halt = calendar_2022.election_day_halt
@@ -15,23 +15,63 @@ mitmdump -s ./har_dump.py --set hardump=./dump.har
 filename endwith '.zhar' will be compressed:
 mitmdump -s ./har_dump.py --set hardump=./dump.zhar
 """
-import base64
+import functools
 import json
 import logging
+import math
 import os
+import time
 import zlib
-from datetime import datetime, timezone
+from binascii import b2a_base64
 
 import mitmproxy
-from mitmproxy import connection, ctx, version
+from mitmproxy import ctx, version
 from mitmproxy.net.http import cookies
 from mitmproxy.utils import strutils
 
+# orjson serializes in native code and returns bytes directly; stdlib json is the fallback.
+# Both emit the same 2-space-indented layout.
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+
+@functools.lru_cache(maxsize=64)
+def _utc_second(sec: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+
+
+def iso_utc(ts: float) -> str:
+    """
+    Same string as datetime.fromtimestamp(ts, timezone.utc).isoformat(), including its
+    half-even rounding to microseconds, built on a cached per-second prefix.
+    Not core.serialization.iso_utc: mitmdump loads this script on its own (-s), outside the
+    repository's import path, and HAR dates keep the '+00:00' isoformat form.
+    """
+    frac, sec = math.modf(ts)
+    us = round(frac * 1e6)
+    if us >= 1_000_000:
+        sec += 1
+        us -= 1_000_000
+    elif us < 0:
+        sec -= 1
+        us += 1_000_000
+    if us:
+        return f"{_utc_second(int(sec))}.{us:06d}+00:00"
+    return f"{_utc_second(int(sec))}+00:00"
+
+
 HAR: dict = {}
 
 # A list of server seen till now is maintained so we can avoid
 # using 'connect' time for entries that use an existing connection.
-SERVERS_SEEN: set[connection.Server] = set()
+# Keyed by the connection's UUID: a plain str hash and compare, and no Server objects kept alive.
+SERVERS_SEEN: set[str] = set()
 
 
 def load(loader: mitmproxy.addonmanager.Loader) -> None:
@@ -65,7 +105,7 @@ def flow_entry(flow: mitmproxy.http.HTTPFlow) -> dict:
     ssl_time = -1
     connect_time = -1
 
-    if flow.server_conn and flow.server_conn not in SERVERS_SEEN:
+    if flow.server_conn and flow.server_conn.id not in SERVERS_SEEN:
         # I am running in upstream mode, and this script crashed because
         # `flow.server_conn.timestamp_tcp_setup` was null. I am not sure if it is
         # a bug present in all modes, of if it is unique to upstream mode. In
@@ -84,7 +124,7 @@ def flow_entry(flow: mitmproxy.http.HTTPFlow) -> dict:
                 - flow.server_conn.timestamp_tcp_setup
             )
 
-        SERVERS_SEEN.add(flow.server_conn)
+        SERVERS_SEEN.add(flow.server_conn.id)
 
     # Calculate raw timings from timestamps. DNS timings can not be calculated
     # due to the lack of a way to measure it. The same goes for HAR blocked.
@@ -107,17 +147,14 @@ def flow_entry(flow: mitmproxy.http.HTTPFlow) -> dict:
     # Timings set to -1 will be ignored as per spec.
     full_time = sum(v for v in timings.values() if v > -1)
 
-    started_date_time = datetime.fromtimestamp(
-        flow.request.timestamp_start, timezone.utc
-    ).isoformat()
+    started_date_time = iso_utc(flow.request.timestamp_start)
 
-    # Response body size and encoding
-    response_body_size = (
-        len(flow.response.raw_content) if flow.response.raw_content else 0
-    )
-    response_body_decoded_size = (
-        len(flow.response.content) if flow.response.content else 0
-    )
+    # Response body size and encoding. The body is decoded once here and reused below,
+    # rather than decompressed again by each .content access.
+    response_raw_content = flow.response.raw_content
+    response_content = flow.response.content
+    response_body_size = len(response_raw_content) if response_raw_content else 0
+    response_body_decoded_size = len(response_content) if response_content else 0
     response_body_compression = response_body_decoded_size - response_body_size
 
     entry = {
@@ -130,7 +167,7 @@ def flow_entry(flow: mitmproxy.http.HTTPFlow) -> dict:
             "cookies": format_request_cookies(flow.request.cookies.fields),
             "headers": name_value(flow.request.headers),
             "queryString": name_value(flow.request.query or {}),
-            "headersSize": len(str(flow.request.headers)),
+            "headersSize": headers_size(flow.request.headers),
             "bodySize": len(flow.request.content),
         },
         "response": {
@@ -145,7 +182,7 @@ def flow_entry(flow: mitmproxy.http.HTTPFlow) -> dict:
                 "mimeType": flow.response.headers.get("Content-Type", ""),
             },
             "redirectURL": flow.response.headers.get("Location", ""),
-            "headersSize": len(str(flow.response.headers)),
+            "headersSize": headers_size(flow.response.headers),
             "bodySize": response_body_size,
         },
         "cache": {},
@@ -153,10 +190,10 @@ def flow_entry(flow: mitmproxy.http.HTTPFlow) -> dict:
     }
 
     # Store binary data as base64
-    if strutils.is_mostly_bin(flow.response.content):
-        entry["response"]["content"]["text"] = base64.b64encode(
-            flow.response.content
-        ).decode()
+    if strutils.is_mostly_bin(response_content):
+        entry["response"]["content"]["text"] = b2a_base64(
+            response_content, newline=False
+        ).decode("ascii")
         entry["response"]["content"]["encoding"] = "base64"
     else:
         entry["response"]["content"]["text"] = flow.response.get_text(strict=False)
@@ -206,7 +243,7 @@ def websocket_end(flow: mitmproxy.http.HTTPFlow):
         if message.is_text:
             data = message.text
         else:
-            data = base64.b64encode(message.content).decode()
+            data = b2a_base64(message.content, newline=False).decode("ascii")
         websocket_message = {
             "type": "send" if message.from_client else "receive",
             "time": message.timestamp,
@@ -219,24 +256,57 @@ def websocket_end(flow: mitmproxy.http.HTTPFlow):
     entry["_webSocketMessages"] = websocket_messages
 
 
+# Indentation of an entry inside log.entries when the HAR is dumped with indent=2
+_ENTRY_INDENT = b"\n      "
+
+
+def _iter_har_json():
+    """
+    Yield the HAR document as UTF-8 bytes, one entry at a time, so the full dump is never
+    held in memory at once. Joined, the pieces are the whole HAR indented by 2 spaces.
+    """
+    log = HAR["log"]
+    entries = log["entries"]
+    head = _dumps({"log": {**log, "entries": []}})
+    if not entries:
+        yield head
+        return
+
+    cut = head.index(b'"entries": []') + len(b'"entries": [')
+    yield head[:cut]
+    sep = _ENTRY_INDENT
+    for entry in entries:
+        yield sep
+        yield _dumps(entry).replace(b"\n", _ENTRY_INDENT)
+        sep = b"," + _ENTRY_INDENT
+    yield b"\n    " + head[cut:]
+
+
 def done():
     """
     Called once on script shutdown, after any other events.
     """
     if ctx.options.hardump:
-        json_dump: str = json.dumps(HAR, indent=2)
-
         if ctx.options.hardump == "-":
-            print(json_dump)
+            for chunk in _iter_har_json():
+                print(chunk.decode(), end="")
+            print()
         else:
-            raw: bytes = json_dump.encode()
-            if ctx.options.hardump.endswith(".zhar"):
-                raw = zlib.compress(raw, 9)
-
+            # .zhar output is compressed as it streams, so it never needs the whole dump either
+            compressor = zlib.compressobj(9) if ctx.options.hardump.endswith(".zhar") else None
+            written = 0
             with open(os.path.expanduser(ctx.options.hardump), "wb") as f:
-                f.write(raw)
+                for chunk in _iter_har_json():
+                    f.write(compressor.compress(chunk) if compressor else chunk)
+                    written += len(chunk)
+                if compressor:
+                    f.write(compressor.flush())
+
+            logging.info("HAR dump finished (wrote %s bytes to file)" % written)
+
 
-            logging.info("HAR dump finished (wrote %s bytes to file)" % len(json_dump))
+# HAR only needs some attributes
+COOKIE_ATTRS = ("path", "domain", "comment")
 
 
 def format_cookies(cookie_list):
@@ -246,23 +316,16 @@ def format_cookies(cookie_list):
         cookie_har = {
             "name": name,
             "value": value,
+            **{key: attrs[key] for key in COOKIE_ATTRS if key in attrs},
+            # These keys need to be boolean!
+            "httpOnly": "httpOnly" in attrs,
+            "secure": "secure" in attrs,
         }
 
-        # HAR only needs some attributes
-        for key in ["path", "domain", "comment"]:
-            if key in attrs:
-                cookie_har[key] = attrs[key]
-
-        # These keys need to be boolean!
-        for key in ["httpOnly", "secure"]:
-            cookie_har[key] = bool(key in attrs)
-
         # Expiration time needs to be formatted
         expire_ts = cookies.get_expiration_ts(attrs)
         if expire_ts is not None:
-            cookie_har["expires"] = datetime.fromtimestamp(
-                expire_ts, timezone.utc
-            ).isoformat()
+            cookie_har["expires"] = iso_utc(expire_ts)
 
         rv.append(cookie_har)
 
@@ -277,6 +340,13 @@ def format_response_cookies(fields):
     return format_cookies((c[0], c[1][0], c[1][1]) for c in fields)
 
 
+def headers_size(headers):
+    """
+    Byte size of the raw header block: "name: value\r\n" per field, plus the closing CRLF.
+    """
+    return sum(len(name) + len(value) + 4 for name, value in headers.fields) + 2
+
+
 def name_value(obj):
     """
     Convert (key, value) pairs to HAR format.
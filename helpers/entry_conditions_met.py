@@ -18,6 +18,25 @@
 
 import numpy as np
 
+VOLUME_MEAN_WINDOW = 20  # bars in the volume baseline
+
+
+def prepare_entry_arrays(data, ema_short='EMA_9', ema_long='EMA_20',
+                         vwap_col='VWAP', vol_col='Volume'):
+    """
+    Flattens the columns entry_conditions_met reads into one float64 array, plus a
+    date -> row position map. Build once per backtest and pass as entry_arrays=...,
+    so each call indexes a row instead of doing a .loc lookup and per-column reads.
+
+    Returns:
+    - arr: ndarray, columns (ema_short, ema_long, vwap, volume, close, open)
+    - pos_map: dict – index label -> row position
+    """
+    open_col = 'Open' if 'Open' in data.columns else 'Close'  # fallback if Open missing
+    arr = data[[ema_short, ema_long, vwap_col, vol_col, 'Close', open_col]].to_numpy(dtype=np.float64)
+    pos_map = {d: i for i, d in enumerate(data.index)}
+    return arr, pos_map
+
 
 def entry_conditions_met(current_date, data, sentiment_score=None,
                          ema_short='EMA_9', ema_long='EMA_20',
@@ -26,7 +45,9 @@ def entry_conditions_met(current_date, data, sentiment_score=None,
                          min_volume_percentile=0.8,
                          sentiment_ok_values=None,
                          logger=None,
-                         return_metadata=False):
+                         return_metadata=False,
+                         precomputed_vol_mean=None,
+                         entry_arrays=None):
     """
     Evaluate whether entry conditions are met on the given day.
 
@@ -42,6 +63,9 @@ def entry_conditions_met(current_date, data, sentiment_score=None,
     - sentiment_ok_values: list of allowed sentiment states (e.g., ['neutral', 'greed'])
     - logger: optional logging object
     - return_metadata: if True, returns (decision, metadata) tuple
+    - precomputed_vol_mean: optional pd.Series, data[vol_col].rolling(20).mean() computed once
+      by the caller for a whole backtest; otherwise only the 20 bars up to current_date are read
+    - entry_arrays: optional (arr, pos_map) from prepare_entry_arrays() with the same column names
 
     Returns:
     - decision: bool – True if all filters pass, else False
@@ -52,7 +76,7 @@ def entry_conditions_met(current_date, data, sentiment_score=None,
         'vwap_condition': False,
         'volume_condition': False,
         'sentiment_condition': False,
-        'date_valid': current_date in data.index,
+        'date_valid': current_date in (data.index if entry_arrays is None else entry_arrays[1]),
         'final_decision': False
     }
 
@@ -66,20 +90,27 @@ def entry_conditions_met(current_date, data, sentiment_score=None,
             return False, metadata
         return False
 
-    row = data.loc[current_date]
+    if entry_arrays is not None:
+        arr, pos_map = entry_arrays
+        pos = pos_map[current_date]
+        ema_s, ema_l, vwap, volume, close_price, open_price = arr[pos].tolist()
+    else:
+        pos = data.index.get_loc(current_date)
+        row = data.loc[current_date]
+        ema_s, ema_l, vwap, volume = row[ema_short], row[ema_long], row[vwap_col], row[vol_col]
+        close_price = row['Close']
+        open_price = row.get('Open', close_price)  # fallback if Open missing
 
     # EMA condition
-    if row[ema_short] > row[ema_long]:
+    if ema_s > ema_l:
         metadata['ema_condition'] = True
     else:
-        log(f"EMA condition failed: {ema_short}={row[ema_short]} <= {ema_long}={row[ema_long]}")
+        log(f"EMA condition failed: {ema_short}={ema_s} <= {ema_long}={ema_l}")
         if return_metadata:
             return False, metadata
         return False
 
     # VWAP proximity
-    close_price = row['Close']
-    vwap = row[vwap_col]
     vwap_distance = abs(close_price - vwap) / close_price
     if vwap_distance <= vwap_proximity_threshold:
         metadata['vwap_condition'] = True
@@ -89,23 +120,30 @@ def entry_conditions_met(current_date, data, sentiment_score=None,
             return False, metadata
         return False
 
-    # Volume check
-    recent_volume = data[vol_col].rolling(20).mean()
-    min_vol = recent_volume.loc[current_date] * min_volume_percentile
-    green_candle = row['Close'] > row.get('Open', row['Close'])  # fallback if Open missing
-    candle_body_pct = abs(row['Close'] - row.get('Open', row['Close'])) / row['Close']
+    # Volume check (mean of the VOLUME_MEAN_WINDOW bars ending at current_date, NaN before that)
+    if precomputed_vol_mean is not None:
+        recent_volume = precomputed_vol_mean.iat[pos]
+    elif pos >= VOLUME_MEAN_WINDOW - 1:
+        recent_volume = data[vol_col].to_numpy()[pos - VOLUME_MEAN_WINDOW + 1:pos + 1].mean()
+    else:
+        recent_volume = np.nan
+    min_vol = recent_volume * min_volume_percentile
 
-    if row[vol_col] >= min_vol:
-        metadata['volume_condition'] = True
-    elif green_candle and candle_body_pct >= 0.01 and row[vol_col] >= 1_000_000:
-        # Override for fast green squeeze candle with good volume baseline
+    if volume >= min_vol:
         metadata['volume_condition'] = True
-        log(f"Volume override: green candle with body {candle_body_pct:.2%} and volume {row[vol_col]:,.0f}")
     else:
-        log(f"Volume too low: {row[vol_col]} < {min_vol:.0f}")
-        if return_metadata:
-            return False, metadata
-        return False
+        # Candle shape only matters once volume is short, for the override below
+        green_candle = close_price > open_price
+        candle_body_pct = abs(close_price - open_price) / close_price
+        if green_candle and candle_body_pct >= 0.01 and volume >= 1_000_000:
+            # Override for fast green squeeze candle with good volume baseline
+            metadata['volume_condition'] = True
+            log(f"Volume override: green candle with body {candle_body_pct:.2%} and volume {volume:,.0f}")
+        else:
+            log(f"Volume too low: {volume} < {min_vol:.0f}")
+            if return_metadata:
+                return False, metadata
+            return False
 
     # Sentiment check
     if sentiment_score is not None and sentiment_ok_values:
@@ -127,3 +165,56 @@ def entry_conditions_met(current_date, data, sentiment_score=None,
     if return_metadata:
         return True, metadata
     return True
+
+
+def entry_conditions_met_batch(data, sentiment_score=None,
+                               ema_short='EMA_9', ema_long='EMA_20',
+                               vwap_col='VWAP', vol_col='Volume',
+                               vwap_proximity_threshold=0.01,
+                               min_volume_percentile=0.8,
+                               sentiment_ok_values=None,
+                               return_metadata=False,
+                               precomputed_vol_mean=None):
+    """
+    Evaluates entry_conditions_met for every row of data at once, with whole-column
+    NumPy comparisons instead of one Python call per bar.
+
+    Parameters are as for entry_conditions_met, except:
+    - sentiment_score: scalar, or array-like aligned with data (one score per row)
+
+    Returns:
+    - decision: ndarray[bool], one per row of data
+    - metadata: dict – Optional, one bool array per condition (if return_metadata=True).
+      Unlike the per-bar metadata, every condition is evaluated on every row, not only
+      up to the first failure.
+    """
+    arr, _ = prepare_entry_arrays(data, ema_short, ema_long, vwap_col, vol_col)
+    ema_s, ema_l, vwap, volume, close, open_ = arr.T
+
+    if precomputed_vol_mean is None:
+        precomputed_vol_mean = data[vol_col].rolling(VOLUME_MEAN_WINDOW).mean()
+    min_vol = np.asarray(precomputed_vol_mean, dtype=np.float64) * min_volume_percentile
+
+    ema_ok = ema_s > ema_l
+    vwap_ok = np.abs(close - vwap) / close <= vwap_proximity_threshold
+
+    # Same volume override as the per-bar check: fast green squeeze candle with good volume baseline
+    squeeze = (close > open_) & (np.abs(close - open_) / close >= 0.01) & (volume >= 1_000_000)
+    vol_ok = (volume >= min_vol) | squeeze
+
+    if sentiment_score is not None and sentiment_ok_values:
+        sent_ok = np.isin(np.asarray(sentiment_score, dtype=object), list(sentiment_ok_values))
+        sent_ok = np.broadcast_to(sent_ok, ema_ok.shape)
+    else:
+        sent_ok = np.ones_like(ema_ok)  # No sentiment filter applied
+
+    decision = ema_ok & vwap_ok & vol_ok & sent_ok
+    if return_metadata:
+        return decision, {
+            'ema_condition': ema_ok,
+            'vwap_condition': vwap_ok,
+            'volume_condition': vol_ok,
+            'sentiment_condition': sent_ok,
+            'final_decision': decision
+        }
+    return decision
@@ -0,0 +1,162 @@
+# Module: momentum_features.py
+# Author: Brian Anderson
+# Origin Date: 01May2025
+# Version: 1.0
+#
+# Purpose:
+#    /Volatility-scaled MACD trend features (Baz et al.) shared by the momentum models.
+#    /For each (S, L) pair: MACD = EWMA(P, 1/S) - EWMA(P, 1/L), scaled by the 63-day price
+#    /deviation, then by the 252-day deviation of that scaled MACD.
+#    /All scales come out of one pass over the prices, and results can be cached on disk
+#    /so repeated backtests over the same prices skip the recompute.
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+# numba is optional; without it the features are built from pandas ewm/rolling calls
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+MACD_SCALES = ((8, 24), (16, 48), (32, 96))  # (short, long) EWMA spans
+PRICE_STD_WINDOW = 63
+SIGNAL_STD_WINDOW = 252
+
+
+def _macd_bank(prices, short_alphas, long_alphas, price_window, signal_window, out):
+    # prices: float64[:] with no NaN; alphas: float64[:] per scale; out: float64[:, :] (n x scales).
+    # EWMAs are the plain recursion seeded with the first price (pandas adjust=False).
+    # Rolling deviations are Welford add/remove with ddof=1; NaN until their window is full.
+    n_scales = short_alphas.shape[0]
+    fast = np.empty(n_scales)
+    slow = np.empty(n_scales)
+    q_hist = np.full((prices.shape[0], n_scales), np.nan)  # scaled MACD, for the 252-day window
+    q_nobs = np.zeros(n_scales, dtype=np.int64)
+    q_mean = np.zeros(n_scales)
+    q_ssqdm = np.zeros(n_scales)
+    p_mean = 0.0
+    p_ssqdm = 0.0
+    same_run = 0  # consecutive identical prices; a fully flat window has exactly zero deviation
+
+    for i in range(prices.shape[0]):
+        p = prices[i]
+
+        # 63-day price deviation
+        p_nobs = min(i + 1, price_window)
+        if i < price_window:
+            delta = p - p_mean
+            p_mean += delta / p_nobs
+            p_ssqdm += delta * (p - p_mean)
+        else:
+            old = prices[i - price_window]
+            delta = p - old
+            old_mean = p_mean
+            p_mean += delta / price_window
+            p_ssqdm += delta * (p - p_mean + old - old_mean)
+        same_run = same_run + 1 if i > 0 and p == prices[i - 1] else 1
+        if same_run >= price_window or p_ssqdm <= 0.0:
+            price_std = 0.0
+        else:
+            price_std = np.sqrt(p_ssqdm / (price_window - 1))
+
+        for k in range(n_scales):
+            if i == 0:
+                fast[k] = p
+                slow[k] = p
+            else:
+                fast[k] = short_alphas[k] * p + (1.0 - short_alphas[k]) * fast[k]
+                slow[k] = long_alphas[k] * p + (1.0 - long_alphas[k]) * slow[k]
+
+            if p_nobs < price_window:
+                out[i, k] = np.nan
+                continue
+            q = (fast[k] - slow[k]) / price_std  # flat prices give 0/0: a gap in the window
+
+            # 252-day deviation of the scaled MACD; non-finite values are left out, so any
+            # window that holds one stays NaN (as with rolling().std())
+            if np.isfinite(q):
+                q_hist[i, k] = q
+                q_nobs[k] += 1
+                delta = q - q_mean[k]
+                q_mean[k] += delta / q_nobs[k]
+                q_ssqdm[k] += delta * (q - q_mean[k])
+            if i >= signal_window:
+                old = q_hist[i - signal_window, k]
+                if old == old:
+                    q_nobs[k] -= 1
+                    if q_nobs[k] == 0:
+                        q_mean[k] = 0.0
+                        q_ssqdm[k] = 0.0
+                    else:
+                        delta = old - q_mean[k]
+                        q_mean[k] -= delta / q_nobs[k]
+                        q_ssqdm[k] -= delta * (old - q_mean[k])
+            if q_nobs[k] == signal_window:
+                q_std = np.sqrt(q_ssqdm[k] / (signal_window - 1)) if q_ssqdm[k] > 0.0 else 0.0
+                out[i, k] = q / q_std
+            else:
+                out[i, k] = np.nan
+    return out
+
+
+# error_model='numpy': a flat stretch divides to NaN/inf as in pandas instead of raising
+_macd_bank_impl = njit(cache=True, error_model='numpy')(_macd_bank) if njit is not None else None
+
+
+def _macd_bank_pandas(prices, scales):
+    p = pd.Series(prices)
+    price_std = p.rolling(PRICE_STD_WINDOW).std()
+    columns = []
+    for short, long in scales:
+        q = (p.ewm(alpha=1 / short, adjust=False).mean()
+             - p.ewm(alpha=1 / long, adjust=False).mean()) / price_std
+        columns.append((q / q.rolling(SIGNAL_STD_WINDOW).std()).to_numpy())
+    return np.column_stack(columns) if columns else np.empty((len(prices), 0))
+
+
+def _compute(prices, scales):
+    if _macd_bank_impl is None:
+        return _macd_bank_pandas(prices, scales)
+    short_alphas = np.array([1.0 / s for s, _ in scales])
+    long_alphas = np.array([1.0 / l for _, l in scales])
+    out = np.empty((len(prices), len(scales)))
+    return _macd_bank_impl(prices, short_alphas, long_alphas, PRICE_STD_WINDOW, SIGNAL_STD_WINDOW, out)
+
+
+def macd_features(prices, scales=MACD_SCALES, cache_dir=None):
+    """
+    Volatility-scaled MACD signals for one price series.
+
+    Parameters:
+    - prices: pd.Series of closes (DatetimeIndex), with no gaps (drop NaN first)
+    - scales: (short, long) EWMA span pairs; EWMA weights are 1/short and 1/long
+    - cache_dir: optional directory; results are stored there keyed on the price bytes and
+      settings, and reloaded on a later call with identical inputs
+
+    Returns:
+    - pd.DataFrame aligned with prices, one 'macd_S_L' column per scale
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    if np.isnan(values).any():
+        raise ValueError("macd_features needs a price series without NaN")
+    scales = tuple((int(s), int(l)) for s, l in scales)
+    columns = [f"macd_{s}_{l}" for s, l in scales]
+
+    path = None
+    if cache_dir is not None:
+        cache_key = hashlib.sha1(
+            values.tobytes() + f"{scales}:{PRICE_STD_WINDOW}:{SIGNAL_STD_WINDOW}".encode()
+        ).hexdigest()[:16]
+        path = os.path.join(cache_dir, f"macd_{cache_key}.npy")
+        if os.path.exists(path):
+            return pd.DataFrame(np.load(path), index=prices.index, columns=columns)
+
+    signals = _compute(values, scales)
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(path, signals)
+    return pd.DataFrame(signals, index=prices.index, columns=columns)
@@ -0,0 +1,97 @@
+# Module: moving_averages.py
+# Author: Brian Anderson
+# Origin Date: 01May2025
+# Version: 1.1
+#
+# Purpose:
+#    /Moving averages for the crossover models, computed in one streaming pass over the prices.
+#    /Every simple and exponential average a model needs shares a single read of each price.
+#    /numba is optional; without it the same columns come from pandas rolling/ewm means.
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _fused_indicators(prices, windows, decays, sma_out, ema_out):
+    # prices: float64[:]; windows: int64[:] SMA lengths; decays: float64[:] EMA (1 - alpha).
+    # sma_out[k] is Series.rolling(windows[k]).mean(): NaN until the window fills or while it
+    # holds a NaN. ema_out[k] follows Series.ewm(span).mean() (adjust=True, ignore_na=False)
+    # step for step, so the EMAs match pandas exactly.
+    n_sma = windows.shape[0]
+    n_ema = decays.shape[0]
+    sums = np.zeros(n_sma)
+    nans = np.zeros(n_sma, dtype=np.int64)
+    weighted = np.full(n_ema, np.nan)
+    old_wt = np.ones(n_ema)
+    for i in range(prices.shape[0]):
+        p = prices[i]
+        observed = p == p
+
+        for k in range(n_sma):
+            w = windows[k]
+            if observed:
+                sums[k] += p
+            else:
+                nans[k] += 1
+            if i >= w:
+                old = prices[i - w]
+                if old != old:
+                    nans[k] -= 1
+                else:
+                    sums[k] -= old
+            sma_out[k, i] = sums[k] / w if i >= w - 1 and nans[k] == 0 else np.nan
+
+        for k in range(n_ema):
+            avg = weighted[k]
+            if avg == avg:
+                old_wt[k] *= decays[k]
+                if observed:
+                    if avg != p:  # avoids rounding drift on a constant series
+                        weighted[k] = (old_wt[k] * avg + p) / (old_wt[k] + 1.0)
+                    old_wt[k] += 1.0
+            elif observed:
+                weighted[k] = p  # first observation starts the average
+            ema_out[k, i] = weighted[k]
+
+
+_fused_indicators_impl = njit(cache=True)(_fused_indicators) if njit is not None else None
+
+
+def fused_indicators(prices, sma_windows=(50, 200), ema_spans=(9, 20)):
+    """
+    Simple and exponential moving averages of a price Series, from one pass over the prices.
+
+    Parameters:
+    - prices: pd.Series of closes
+    - sma_windows: window lengths, as in prices.rolling(window).mean()
+    - ema_spans: spans, as in prices.ewm(span=span).mean()
+
+    Returns:
+    - (smas, emas): lists of float64 ndarrays aligned with prices, in argument order
+    """
+    if _fused_indicators_impl is None:
+        return ([prices.rolling(w).mean().to_numpy() for w in sma_windows],
+                [prices.ewm(span=s).mean().to_numpy() for s in ema_spans])
+    values = np.asarray(prices, dtype=np.float64)
+    windows = np.asarray(sma_windows, dtype=np.int64)
+    # Same alpha arithmetic as pandas (span -> center of mass -> alpha)
+    decays = np.array([1.0 - 1.0 / (1.0 + (s - 1) / 2) for s in ema_spans], dtype=np.float64)
+    sma_out = np.empty((len(windows), len(values)))
+    ema_out = np.empty((len(decays), len(values)))
+    _fused_indicators_impl(values, windows, decays, sma_out, ema_out)
+    return list(sma_out), list(ema_out)
+
+
+def dual_sma(prices, short_window=50, long_window=200):
+    """
+    Short and long simple moving averages of a price Series.
+
+    Returns:
+    - (short_sma, long_sma): float64 ndarrays aligned with prices, NaN until each window fills
+    """
+    short_sma, long_sma = fused_indicators(prices, (short_window, long_window), ())[0]
+    return short_sma, long_sma
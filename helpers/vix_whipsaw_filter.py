@@ -21,21 +21,62 @@
 # - When testing, ensure each trigger path (yellow, red, revert, cooldown) is hit at least once.
 
 import pandas as pd
+import numpy as np
+from dataclasses import dataclass, fields
 from datetime import timedelta
+from enum import IntEnum
 
-def vix_whipsaw_filter(current_date, vix_data, state):
+# numba is optional; without it vix_whipsaw_sweep runs the same loop in plain Python
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+VOLATILITY_FLOOR_WINDOW = timedelta(days=21)  # red-light floor looks back three weeks
+
+def three_week_vix_low(vix_data):
+    """
+    Lowest VIX close over [date - 21 days, date] for every date in vix_data, i.e. the
+    window vix_whipsaw_filter checks in the red-light regime. Compute once per backtest
+    and pass as vix_three_week_low=... so each red-light day is a single lookup.
+    """
+    return vix_data.rolling(VOLATILITY_FLOOR_WINDOW, closed='both').min()
+
+def vix_index_positions(vix_data):
+    """
+    Date -> row position map for vix_data. Build once per backtest and pass as
+    vix_index_pos=... so each call is one dict lookup instead of an index search.
+    """
+    return {d: i for i, d in enumerate(vix_data.index)}
+
+@dataclass(slots=True)
+class VixFilterState:
+    '''Filter state carried between vix_whipsaw_filter calls; unset dates are None'''
+    red_light_until: object = None   # datetime
+    volatility_floor: float = None
+    cooldown_until: object = None    # datetime
+    observation_day: object = None   # datetime, yellow rebound test day
+    last_trigger_day: object = None  # datetime
+    observe_red_on: object = None    # datetime, red rebound test day
+    red_watch: bool = False
+    red_count: int = 0
+
+def vix_whipsaw_filter(current_date, vix_data, state, vix_three_week_low=None, vix_index_pos=None):
     """
     Evaluates whether VIX behavior triggers yellow or red regime changes.
 
     Parameters:
     - current_date: datetime
     - vix_data: pd.Series (daily VIX close values)
-    - state: dict tracking:
+    - state: VixFilterState tracking:
         - cooldown_until
         - observation_day
         - red_light_until
         - red_count
         - volatility_floor
+      A plain dict with these keys (e.g. {} to start) is also accepted and updated in place.
+    - vix_three_week_low: optional pd.Series from three_week_vix_low(vix_data)
+    - vix_index_pos: optional dict from vix_index_positions(vix_data)
 
     Returns:
     - decision: str
@@ -46,88 +87,227 @@ def vix_whipsaw_filter(current_date, vix_data, state):
         - 'red_watch_triggered' – Large VIX drop observed; watching for dangerous rebound.
         - 'red_light_active' – Confirmed volatility spike; trading halted for multiple days.
         - 'revert_to_strict' – Rebound after yellow anomaly confirmed; enter cooldown.
-    - updated state: dict
+    - updated state: VixFilterState, or the caller's dict when one was passed
         The internal filter state after applying current date logic.
     """
 
+    if isinstance(state, dict):
+        # Run on a VixFilterState, then write every field back so the caller's dict stays current
+        decision, updated = vix_whipsaw_filter(current_date, vix_data, VixFilterState(**state),
+                                               vix_three_week_low, vix_index_pos)
+        state.update({f.name: getattr(updated, f.name) for f in fields(VixFilterState)})
+        return decision, state
+
     # Safety check: skip if data is missing for current date
-    if current_date not in vix_data.index:
+    if vix_index_pos is not None:
+        idx = vix_index_pos.get(current_date)
+        if idx is None:
+            return 'normal', state
+    elif current_date in vix_data.index:
+        idx = vix_data.index.get_loc(current_date)
+    else:
         return 'normal', state
+    vix_arr = vix_data.to_numpy()  # all reads below are by position
 
     # === Red light logic overrides everything ===
-    if state.get('red_light_until') and current_date <= state['red_light_until']:
-        current_vix = vix_data.loc[current_date]
+    if state.red_light_until is not None and current_date <= state.red_light_until:
+        current_vix = vix_arr[idx]
 
-        # Define recent 3-week window for volatility floor check
-        recent_window = vix_data[current_date - timedelta(days=21):current_date]
-        three_week_low = recent_window.min() if not recent_window.empty else current_vix
+        # Recent 3-week low for volatility floor check (current_date is in the window, so it's never empty)
+        if vix_three_week_low is not None:
+            three_week_low = vix_three_week_low.iat[idx]
+        else:
+            three_week_low = vix_data[current_date - VOLATILITY_FLOOR_WINDOW:current_date].min()
         volatility_floor = min(three_week_low, 38)  # Additional hard threshold floor
 
         if current_vix < volatility_floor:
             # Exit red regime if volatility recovers
-            state.pop('red_light_until', None)
-            state.pop('volatility_floor', None)
+            state.red_light_until = None
+            state.volatility_floor = None
             return 'normal', state
         else:
             # Continue red regime and update stored floor
-            state['volatility_floor'] = volatility_floor
+            state.volatility_floor = volatility_floor
             return 'red_light_active', state
 
     # === Yellow light cooldown logic ===
-    if state.get('cooldown_until') and current_date <= state['cooldown_until']:
+    if state.cooldown_until is not None and current_date <= state.cooldown_until:
         return 'cooldown_active', state
 
     # === Get today and yesterday's VIX for comparison ===
-    today_vix = vix_data.loc[current_date]
-    idx = vix_data.index.get_loc(current_date)
     if idx == 0:
         return 'normal', state  # No previous day to compare against
 
-    prev_date = vix_data.index[idx - 1]
-    prev_vix = vix_data.loc[prev_date]
+    today_vix = vix_arr[idx]
+    prev_vix = vix_arr[idx - 1]
 
     # === Yellow light trigger (8% drop, VIX > 30) ===
     drop_pct = (prev_vix - today_vix) / prev_vix
     if prev_vix > 30 and drop_pct > 0.08:
-        state['observation_day'] = current_date + timedelta(days=1)
-        state['last_trigger_day'] = current_date
+        state.observation_day = current_date + timedelta(days=1)
+        state.last_trigger_day = current_date
         return 'cooling_triggered', state
 
     # === Red light trigger (any 7% drop followed by 4% rebound) ===
     if drop_pct > 0.07:
-        state['observe_red_on'] = current_date + timedelta(days=1)
-        state['red_watch'] = True
+        state.observe_red_on = current_date + timedelta(days=1)
+        state.red_watch = True
         return 'red_watch_triggered', state
 
     # === Handle yellow observation logic ===
-    if state.get('observation_day') == current_date:
+    if state.observation_day == current_date:
         rebound_pct = (today_vix - prev_vix) / prev_vix
         if rebound_pct >= 0.045:
             # Confirmed rebound, activate cooldown
-            state['cooldown_until'] = current_date + timedelta(hours=72)
-            state.pop('observation_day', None)
+            state.cooldown_until = current_date + timedelta(hours=72)
+            state.observation_day = None
             return 'revert_to_strict', state
         else:
             # Observation failed, return to normal
-            state.pop('observation_day', None)
+            state.observation_day = None
             return 'normal', state
 
     # === Handle red observation logic ===
-    if state.get('observe_red_on') == current_date and state.get('red_watch'):
+    if state.red_watch and state.observe_red_on == current_date:
         rebound_pct = (today_vix - prev_vix) / prev_vix
         if rebound_pct >= 0.04:
             # Escalate to red if rebound occurs after drop
-            state['red_count'] = state.get('red_count', 0) + 1
-            cooldown_hours = 72 if state['red_count'] == 1 else 144
-            state['red_light_until'] = current_date + timedelta(hours=cooldown_hours)
-            state['red_watch'] = False
-            state.pop('observe_red_on', None)
+            state.red_count += 1
+            cooldown_hours = 72 if state.red_count == 1 else 144
+            state.red_light_until = current_date + timedelta(hours=cooldown_hours)
+            state.red_watch = False
+            state.observe_red_on = None
             return 'red_light_active', state
         else:
             # No escalation, dismiss red watch
-            state['red_watch'] = False
-            state.pop('observe_red_on', None)
+            state.red_watch = False
+            state.observe_red_on = None
             return 'normal', state
 
     # === Default regime ===
     return 'normal', state
+
+
+# === Whole-series sweep ===
+# The per-date filter above is a serial state machine, so a backtest can run it once over the
+# full series instead: state lives in local scalars and each day's regime is an int8 code.
+
+class Regime(IntEnum):
+    NORMAL = 0
+    COOLING_TRIGGERED = 1
+    COOLDOWN_ACTIVE = 2
+    RED_WATCH_TRIGGERED = 3
+    RED_LIGHT_ACTIVE = 4
+    REVERT_TO_STRICT = 5
+
+# Regime code -> the string vix_whipsaw_filter returns
+REGIME_NAMES = ('normal', 'cooling_triggered', 'cooldown_active',
+                'red_watch_triggered', 'red_light_active', 'revert_to_strict')
+
+_NS_PER_HOUR = 3_600 * 10**9
+_NO_DATE = np.iinfo(np.int64).min  # unset state date; no timestamp equals it or is <= it
+
+def _sweep(times, vix, low, active, out):
+    # times: int64 ns timestamps; vix: float64 closes; low: float64 three-week lows.
+    # active: bool, the rows the filter is called on; other rows leave the state alone.
+    # Mirrors vix_whipsaw_filter day by day, starting from an empty state.
+    red_until = _NO_DATE
+    cooldown_until = _NO_DATE
+    observation_day = _NO_DATE
+    observe_red_on = _NO_DATE
+    red_watch = False
+    red_count = 0
+    for i in range(times.shape[0]):
+        if not active[i]:
+            out[i] = 0
+            continue
+        t = times[i]
+
+        if t <= red_until:
+            low_i = low[i]
+            volatility_floor = 38.0 if 38.0 < low_i else low_i  # min(three_week_low, 38)
+            if vix[i] < volatility_floor:
+                red_until = _NO_DATE
+                out[i] = 0  # NORMAL
+            else:
+                out[i] = 4  # RED_LIGHT_ACTIVE
+            continue
+
+        if t <= cooldown_until:
+            out[i] = 2  # COOLDOWN_ACTIVE
+            continue
+
+        if i == 0:
+            out[i] = 0
+            continue
+
+        today_vix = vix[i]
+        prev_vix = vix[i - 1]
+        drop_pct = (prev_vix - today_vix) / prev_vix
+        if prev_vix > 30 and drop_pct > 0.08:
+            observation_day = t + 24 * _NS_PER_HOUR
+            out[i] = 1  # COOLING_TRIGGERED
+            continue
+
+        if drop_pct > 0.07:
+            observe_red_on = t + 24 * _NS_PER_HOUR
+            red_watch = True
+            out[i] = 3  # RED_WATCH_TRIGGERED
+            continue
+
+        if observation_day == t:
+            observation_day = _NO_DATE
+            if (today_vix - prev_vix) / prev_vix >= 0.045:
+                cooldown_until = t + 72 * _NS_PER_HOUR
+                out[i] = 5  # REVERT_TO_STRICT
+            else:
+                out[i] = 0
+            continue
+
+        if observe_red_on == t and red_watch:
+            red_watch = False
+            observe_red_on = _NO_DATE
+            if (today_vix - prev_vix) / prev_vix >= 0.04:
+                red_count += 1
+                red_until = t + (72 if red_count == 1 else 144) * _NS_PER_HOUR
+                out[i] = 4
+            else:
+                out[i] = 0
+            continue
+
+        out[i] = 0
+    return out
+
+# error_model='numpy' keeps float division semantics identical to the NumPy scalars used above
+_sweep_impl = njit(cache=True, error_model='numpy')(_sweep) if njit is not None else _sweep
+
+def vix_whipsaw_sweep(vix_data, vix_three_week_low=None, dates=None):
+    """
+    Runs vix_whipsaw_filter over the dates of vix_data in one pass, from an empty state.
+
+    Parameters:
+    - vix_data: pd.Series (daily VIX close values, DatetimeIndex)
+    - vix_three_week_low: optional pd.Series from three_week_vix_low(vix_data)
+    - dates: optional ascending DatetimeIndex of the days the filter is called on
+      (e.g. a strategy's tradable days); None means every row of vix_data
+
+    Returns:
+    - regimes: ndarray[int8] of Regime codes, one per row of vix_data, or one per entry of
+      dates when given (REGIME_NAMES[code] gives the string the per-date filter would return)
+    """
+    if vix_three_week_low is None:
+        vix_three_week_low = three_week_vix_low(vix_data)
+    times = vix_data.index.values.astype('datetime64[ns]').view(np.int64)
+    vix = vix_data.to_numpy(dtype=np.float64)
+    low = np.asarray(vix_three_week_low, dtype=np.float64)
+    out = np.empty(len(vix), dtype=np.int8)
+    if dates is None:
+        return _sweep_impl(times, vix, low, np.ones(len(vix), dtype=np.bool_), out)
+
+    # Dates with no VIX row are 'normal' and leave the state unchanged, as in the per-date filter
+    pos = vix_data.index.get_indexer(dates)
+    found = pos >= 0
+    active = np.zeros(len(vix), dtype=np.bool_)
+    active[pos[found]] = True
+    _sweep_impl(times, vix, low, active, out)
+    return np.where(found, out[pos], np.int8(Regime.NORMAL))
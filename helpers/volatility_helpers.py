@@ -7,8 +7,15 @@
 #    /Establish supporting functions for advanced VIX/SPY filtering in divergence or
 #    /volatility-aware strategies.
 
+import numpy as np
 import pandas as pd
 
+# numba is optional; without it the stress streak comes from a numpy reset-on-False scan
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 def add_multiday_confirmation(data, vix_days=3, vix_threshold=0.10):
     """
     Adds a column to confirm VIX rising across a short time window.
@@ -21,7 +28,13 @@ def add_multiday_confirmation(data, vix_days=3, vix_threshold=0.10):
     Returns:
         DataFrame with new column 'VIX_Confirm'.
     """
-    data['VIX_Confirm'] = data['VIX_Change'].rolling(vix_days).sum() > vix_threshold
+    # Window sums straight from a strided view: no cumsum drift, and a NaN only voids its own windows
+    change = data['VIX_Change'].to_numpy(dtype=np.float64)
+    confirm = np.zeros(len(change), dtype=np.bool_)  # first vix_days - 1 rows have no full window
+    if len(change) >= vix_days:
+        window_sum = np.lib.stride_tricks.sliding_window_view(change, vix_days).sum(axis=1)
+        np.greater(window_sum, vix_threshold, out=confirm[vix_days - 1:])
+    data['VIX_Confirm'] = confirm
     return data
 
 
@@ -37,15 +50,11 @@ def add_vix_term_structure(data, vix_front, vix_3m):
     Returns:
         DataFrame with new column 'Term_Inversion'.
     """
-    combined = pd.DataFrame({
-        'VIX_Front': vix_front,
-        'VIX_3M': vix_3m
-    }).dropna()
-
-    combined['Term_Inversion'] = combined['VIX_Front'] > combined['VIX_3M']
-
-    data = data.join(combined['Term_Inversion'], how='left')
-    data['Term_Inversion'].fillna(False, inplace=True)
+    # Compare on the dates both series share (NaN compares False), then spread onto data's
+    # dates; dates with no pair of quotes are not inverted
+    front, back = vix_front.align(vix_3m, join='inner')
+    inversion = pd.Series(front.to_numpy() > back.to_numpy(), index=front.index)
+    data['Term_Inversion'] = inversion.reindex(data.index, fill_value=False)
     return data
 
 
@@ -62,18 +71,26 @@ def add_stress_regime_flag(data, vix_series, threshold=60, min_duration=3):
     Returns:
         DataFrame with new column 'Stress_Regime'.
     """
-    # Identify stress days (True if VIX > threshold)
-    is_stressed = vix_series > threshold
-
-    # Convert boolean to integer (True = 1, False = 0)
-    stressed_int = is_stressed.astype(int)
+    # One scan: count consecutive days with VIX > threshold, flag once the count reaches min_duration
+    vix = vix_series.to_numpy(dtype=np.float64)
+    if _stress_streak_impl is not None:
+        out = _stress_streak_impl(vix, threshold, min_duration, np.empty(len(vix), dtype=np.bool_))
+    else:
+        # streak = rows since the last non-stress day (-1 before the first one)
+        stressed = vix > threshold
+        idx = np.arange(len(vix))
+        last_calm = np.maximum.accumulate(np.where(stressed, -1, idx))
+        out = idx - last_calm >= min_duration
+    data['Stress_Regime'] = pd.Series(out, index=vix_series.index)
+    return data
 
-    # Identify groupings of consecutive True values using cumsum on ~is_stressed
-    group_id = (~is_stressed).cumsum()
 
-    # Within each group, count consecutive days of stress using cumsum again
-    stress_streak = stressed_int.groupby(group_id).cumsum()
+def _stress_streak(vix, threshold, min_duration, out):
+    # NaN compares False, so a missing day ends a streak as it did with the groupby form
+    streak = 0
+    for i in range(vix.shape[0]):
+        streak = streak + 1 if vix[i] > threshold else 0
+        out[i] = streak >= min_duration
+    return out
 
-    # Then, flag regimes where the count exceeds minimum duration
-    data['Stress_Regime'] = stress_streak >= min_duration
-    return data
+_stress_streak_impl = njit(cache=True)(_stress_streak) if njit is not None else None
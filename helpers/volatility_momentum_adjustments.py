@@ -10,7 +10,122 @@
 #   /should provide an organically-adaptive framework that anneals out the presuppositions of continuous
 #   /market behavior--faster growth, but more aggressive-adjusting over the previous 20 years or so.
 
-# May be missing an import here, check later
+import numpy as np
+import pandas as pd
+
+# numba is optional; without it the scores come from numpy/pandas array operations
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+# Trading-day lookbacks for the 6- and 12-month windows
+SHORT_PERIODS = 126
+LONG_PERIODS = 252
+
+# (6mo weight, 12mo weight) for the up/up branches; the other sign branches are still open,
+# so they score NaN until their coefficients are settled
+UP_UP_ACCELERATING_WEIGHTS = (2, 5)  # 6mo > 12mo: lean on the year-long value
+UP_UP_COOLING_WEIGHTS = (4, 5)       # 6mo < 12mo: trust the 6 month a little more
+
+
+def _lagged_momentum(prices, periods):
+    # data.pct_change(periods).shift(1) on the raw (dates x tickers) array
+    out = np.full(prices.shape, np.nan)
+    out[periods + 1:] = prices[periods:-1] / prices[:-periods - 1] - 1
+    return out
+
+
+# Compiled per-ticker kernels: every column is independent until the caller combines them,
+# so prange hands each core its own slice of tickers. Momentum is recomputed from the prices
+# when it leaves the window, so no (dates x tickers) temporaries are allocated.
+# fastmath stays off so results match the numpy/pandas path, NaN handling included.
+
+def _normalized_momentum_columns(prices, periods, window, out):
+    # out[:, j] = lagged momentum / (rolling deviation of that momentum + 1e-4), as in
+    # self_normalized_momentum; the deviation is a rolling Welford add/remove (ddof=1)
+    n = prices.shape[0]
+    for j in prange(prices.shape[1]):
+        nobs = 0
+        mean = 0.0
+        ssqdm = 0.0
+        for i in range(n):
+            m = prices[i - 1, j] / prices[i - 1 - periods, j] - 1 if i > periods else np.nan
+            if m == m:
+                nobs += 1
+                delta = m - mean
+                mean += delta / nobs
+                ssqdm += delta * (m - mean)
+            k = i - window
+            if k > periods:
+                old = prices[k - 1, j] / prices[k - 1 - periods, j] - 1
+                if old == old:
+                    nobs -= 1
+                    if nobs == 0:
+                        mean = 0.0
+                        ssqdm = 0.0
+                    else:
+                        delta = old - mean
+                        mean -= delta / nobs
+                        ssqdm -= delta * (old - mean)
+            if nobs == window:
+                std = np.sqrt(ssqdm / (nobs - 1)) if ssqdm > 0.0 else 0.0
+                out[i, j] = m / (std + 1e-4)
+            else:
+                out[i, j] = np.nan
+    return out
+
+
+def _weighted_momentum_columns(prices, short, long, accelerating, cooling, out):
+    # out[:, j] = internal_volatility_adjusted_momentum for ticker j; weights are (6mo, 12mo)
+    n = prices.shape[0]
+    a6, a12 = accelerating
+    c6, c12 = cooling
+    for j in prange(prices.shape[1]):
+        for i in range(n):
+            out[i, j] = np.nan
+            if i <= long:
+                continue
+            m6 = prices[i - 1, j] / prices[i - 1 - short, j] - 1
+            m12 = prices[i - 1, j] / prices[i - 1 - long, j] - 1
+            if m6 > 0 and m12 > 0:
+                if m6 > m12:
+                    out[i, j] = (a6 * m6 + a12 * m12) / (a6 + a12)
+                elif m6 < m12:
+                    out[i, j] = (c6 * m6 + c12 * m12) / (c6 + c12)
+    return out
+
+
+# error_model='numpy': a zero price divides to inf/NaN as on the numpy path instead of raising
+if njit is not None:
+    _normalized_momentum_impl = njit(cache=True, parallel=True, error_model='numpy')(_normalized_momentum_columns)
+    _weighted_momentum_impl = njit(cache=True, parallel=True, error_model='numpy')(_weighted_momentum_columns)
+else:
+    _normalized_momentum_impl = _weighted_momentum_impl = None
+
+
+def self_normalized_momentum(data, periods=LONG_PERIODS, window=LONG_PERIODS):
+    '''
+    Each stock's lagged momentum divided by the rolling deviation of that same momentum,
+    flagging stocks moving unusually fast relative to their own baseline.
+
+    Parameters:
+        data: pd.DataFrame of prices indexed by date with tickers as columns.
+        periods: momentum lookback in rows (126 ~ 6 months, 252 ~ 12 months).
+        window: rows in the rolling deviation.
+
+    Returns:
+        pd.DataFrame shaped like data.
+    '''
+    prices = data.to_numpy(dtype=np.float64)
+    if _normalized_momentum_impl is not None:
+        score = _normalized_momentum_impl(prices, periods, window, np.empty(prices.shape))
+    else:
+        momentum = _lagged_momentum(prices, periods)
+        score = momentum / (pd.DataFrame(momentum).rolling(window).std().to_numpy() + 1e-4)
+    return pd.DataFrame(score, index=data.index, columns=data.columns)
+
 
 def internal_volatility_adjusted_momentum(data):
     '''
@@ -23,8 +138,9 @@ def internal_volatility_adjusted_momentum(data):
             Price data indexed by date with tickers as columns.
 
     Returns:
-        internal_momentum_weighted: pd.Series or float
-            Weighted internal momentum score (implementation-specific)
+        internal_momentum_weighted: pd.DataFrame
+            Weighted internal momentum score shaped like data; NaN where the
+            sign branch has no weights yet (see UP_UP_*_WEIGHTS)
     
 
     # In support of further refinement of '12-1 Momentum...' Model
@@ -113,5 +229,21 @@ def internal_volatility_adjusted_momentum(data):
     # general market volatility momentum adjustments.
     '''
 
-
-    return None  # Placeholder so function is syntactically valid
+    prices = data.to_numpy(dtype=np.float64)
+    if _weighted_momentum_impl is not None:
+        weighted = _weighted_momentum_impl(prices, SHORT_PERIODS, LONG_PERIODS, UP_UP_ACCELERATING_WEIGHTS,
+                                           UP_UP_COOLING_WEIGHTS, np.empty(prices.shape))
+        return pd.DataFrame(weighted, index=data.index, columns=data.columns)
+
+    # Whole (dates x tickers) matrix at once: one momentum array per window, then the
+    # piecewise weights picked by sign masks
+    m6 = _lagged_momentum(prices, SHORT_PERIODS)
+    m12 = _lagged_momentum(prices, LONG_PERIODS)
+
+    up_up = (m6 > 0) & (m12 > 0)
+    (a6, a12), (c6, c12) = UP_UP_ACCELERATING_WEIGHTS, UP_UP_COOLING_WEIGHTS
+    weighted = np.select(
+        [up_up & (m6 > m12), up_up & (m6 < m12)],
+        [(a6 * m6 + a12 * m12) / (a6 + a12), (c6 * m6 + c12 * m12) / (c6 + c12)],
+        default=np.nan)
+    return pd.DataFrame(weighted, index=data.index, columns=data.columns)
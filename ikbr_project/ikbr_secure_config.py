@@ -32,6 +32,14 @@ ENABLE_ORDER_EXECUTION = 'N'
 ENABLE_CONFIG_VALIDATION = 'Y'
 ENABLE_CONFIG_LOGGING = 'Y'
 ENABLE_LOG_DEDUP = 'Y'
+ENABLE_POSITIONS_CSV = 'N'  # positions.csv alongside positions.parquet (always written without pyarrow)
+
+# The same toggles as bools, resolved once at import; code below tests these
+_TIME_WAIT = ENABLE_TIME_WAIT == 'Y'
+_CONFIG_VALIDATION = ENABLE_CONFIG_VALIDATION == 'Y'
+_LOG_ENABLED = ENABLE_CONFIG_LOGGING == 'Y'
+_DEDUP_ENABLED = ENABLE_LOG_DEDUP == 'Y'
+_POSITIONS_CSV = ENABLE_POSITIONS_CSV == 'Y'
 
 # Explain time definitions
 # Beware of permitting orders to be released at exact times below,
@@ -40,28 +48,33 @@ ENABLE_LOG_DEDUP = 'Y'
 # except for options after hours between 4pm and 4:15pm.
 
 # === MARKET TIME DELINEATION ===
+# Minutes since midnight, US Eastern: checks against now_est_minutes() are plain int compares.
+# Members sharing a minute are aliases (POSTMARKET_OPEN is MARKET_CLOSE).
+
+from enum import IntEnum
 
-# It is no ideal to be holding a heavy futures position during 2 to 4 am.
-MORNING_FUTURES_EURO_CLOSE = dtime(2,0)  
-MORNING_FUTURES_EURO_OPEN = dtime(4,0)
+class MktMinute(IntEnum):
+    # It is no ideal to be holding a heavy futures position during 2 to 4 am.
+    MORNING_FUTURES_EURO_CLOSE = 2 * 60
+    MORNING_FUTURES_EURO_OPEN = 4 * 60
 
-This is the point when most brokerages permit retail purchase activity.
-PREMARKET_OPEN = dtime(7,0)
-MARKET_OPEN = dtime(9,30)
+    # This is the point when most brokerages permit retail purchase activity.
+    PREMARKET_OPEN = 7 * 60
+    MARKET_OPEN = 9 * 60 + 30
 
-# Brokerages close options activity for most equities.
-MARKET_CLOSE = dtime(16,0)
-POSTMARKET_OPEN = dtime(16,0)
+    # Brokerages close options activity for most equities.
+    MARKET_CLOSE = 16 * 60
+    POSTMARKET_OPEN = 16 * 60
 
-# Most brokerages shut down the trading period of special options at this point.
-POSTMARKET_OPTIONS_CLOSE = dtime(16,15)  
+    # Most brokerages shut down the trading period of special options at this point.
+    POSTMARKET_OPTIONS_CLOSE = 16 * 60 + 15
 
-# American futures market closes for maintenance from 5 to 6 pm.
-FUTURES_AMERICAN_CLOSE = dtime(17,0)  
-FUTURES_AMERICAN_OPEN = dtime(18,0)
+    # American futures market closes for maintenance from 5 to 6 pm.
+    FUTURES_AMERICAN_CLOSE = 17 * 60
+    FUTURES_AMERICAN_OPEN = 18 * 60
 
-# No further trading of equities.
-AFTERMARKET_CLOSE = dtime(20,0)  
+    # No further trading of equities.
+    AFTERMARKET_CLOSE = 20 * 60
 
 # === END OF MARKET TIME DELINEATION ===
 
@@ -70,19 +83,29 @@ AFTERMARKET_CLOSE = dtime(20,0)
 _last_error_message = None
 _last_error_time = 0
 
+import functools
 import json
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
 from ib_insync import IB, util
-from datetime import datetime, time as dtime
+from datetime import datetime, timedelta, time as dtime
 import pytz
-from ibkr_secure_config import get_ibkr_config
 import os
 import logging
 import time
 
+# pyarrow is optional; without it positions are exported as CSV only
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
 # If choosing to send data to OneDrive...
 # replace 'with open(... , with the following:
 # onedrive_path = Path("C:/Users/Butchman2000/OneDrive/IBKR/positions.json")
@@ -114,10 +137,11 @@ def place_order():
         raise RuntimeError("Trade count limit exceeded.")
 
 
+@functools.lru_cache(maxsize=1)
 def get_ibkr_config():
     """
     Retrieves and validates IBKR connection settings.
-    Returns a dictionary with config data.
+    Returns a read-only mapping with config data, read from the environment once per process.
     Logs warnings or errors for any missing or invalid entries.
     """
     def _get_env(name, default=None, cast=str):
@@ -131,13 +155,13 @@ def get_ibkr_config():
             logging.error(f"Invalid format for {name}: expected {cast.__name__}")
             raise
 
-    config = {
+    config = MappingProxyType({
         "USE_PAPER": _get_env("USE_PAPER", "True", lambda x: x.lower() == "true"),  # TODO: ensure my use of lambda is correct
         "IB_GATEWAY_HOST": _get_env("IB_GATEWAY_HOST", "127.0.0.1"),
         "IB_GATEWAY_PORT_PAPER": _get_env("IB_GATEWAY_PORT_PAPER", 7497, int),
         "IB_GATEWAY_PORT_LIVE": _get_env("IB_GATEWAY_PORT_LIVE", 7496, int),
         "IB_CLIENT_ID": _get_env("IB_CLIENT_ID", 1, int)
-    }
+    })
 
     logging.info("IBKR config loaded and validated.")
     return config
@@ -154,16 +178,21 @@ if ENABLE_CONFIG_LOGGING == 'Y':
     '''
 
 
+_logger = logging.getLogger(__name__)
+
+
 def log_error_once(message):
     global _last_error_message, _last_error_time
-    now = time.time()
-    if ENABLE_LOG_DEDUP == 'Y':
+    if not _logger.isEnabledFor(logging.ERROR):
+        return
+    if _DEDUP_ENABLED:
+        now = time.time()
         if message == _last_error_message and (now - _last_error_time) <= 5:
-            logging.error(f"DOUBLE: {message}")
+            _logger.error("DOUBLE: %s", message)
             return
         _last_error_message = message
         _last_error_time = now
-    logging.error(message)
+    _logger.error(message)
 
 
 # Config validation (additional layer)
@@ -176,16 +205,16 @@ def validate_config(cfg):
     for key in required_keys:
         if key not in cfg:
             msg = f"Missing required config key: {key}"
-            if ENABLE_CONFIG_LOGGING == 'Y':
+            if _LOG_ENABLED:
                 log_error_once(msg)
             raise KeyError(msg)
-    if ENABLE_CONFIG_LOGGING == 'Y':
+    if _LOG_ENABLED:
         logging.info("Config validation passed.")
 
 
 # Load and optionally validate config
 config = get_ibkr_config()
-if ENABLE_CONFIG_VALIDATION == 'Y':
+if _CONFIG_VALIDATION:
     validate_config(config)
 
 USE_PAPER = config["USE_PAPER"]
@@ -202,15 +231,17 @@ else
 
 IB_CLIENT_ID = config["IB_CLIENT_ID"]
 
-# Time window example (US Eastern time)
-MARKET_OPEN = dtime(9, 30)
-MARKET_CLOSE = dtime(16, 0)
+# Time window example (US Eastern time; see MktMinute)
 EASTERN = pytz.timezone('US/Eastern')
 
 
+def now_est_minutes():
+    t = datetime.now(EASTERN)
+    return t.hour * 60 + t.minute
+
+
 def is_market_open():
-    now_est = datetime.now(EASTERN).time()
-    return MARKET_OPEN <= now_est <= MARKET_CLOSE
+    return MktMinute.MARKET_OPEN <= now_est_minutes() < MktMinute.MARKET_CLOSE
 
 
 def connect_ibkr():
@@ -218,15 +249,15 @@ def connect_ibkr():
     try:
         ib.connect(IB_GATEWAY_HOST, IB_GATEWAY_PORT, clientId=IB_CLIENT_ID)
         if USE_PAPER == True:
-            print(f"Connected to IBKR ({'Paper'})
+            print("Connected to IBKR (Paper)")
         else:
-            print(f"Connected to IBKR ({'Live'}))
+            print("Connected to IBKR (Live)")
 
-        if ENABLE_CONFIG_LOGGING == 'Y':
+        if _LOG_ENABLED:
             logging.info("IBKR connection successful.")
     except Exception as e:
         print("Failed to connect to IBKR:", e)
-        if ENABLE_CONFIG_LOGGING == 'Y':
+        if _LOG_ENABLED:
             log_error_once(f"Connection failed: {e}")
         return None
     return ib
@@ -250,28 +281,55 @@ def export_positions(ib):
         "position": position
     } for acct, contract, position in positions]
 
+    # JSON goes to a worker thread so the connected session isn't held up by disk writes
+    json_write = _EXPORT_POOL.submit(_write_positions_json, position_data)
+    json_write.add_done_callback(_report_export_error)
+
+    # One columnar table instead of a DataFrame rendered cell by cell into CSV text
+    if pq is not None:
+        pq.write_table(pa.Table.from_pylist(position_data), "positions.parquet")
+    if pq is None or _POSITIONS_CSV:
+        pd.DataFrame(position_data).to_csv("positions.csv", index=False)
+    return json_write
+
+
+# Single worker: exports land in call order; the interpreter waits for it before exiting
+_EXPORT_POOL = ThreadPoolExecutor(max_workers=1)
+
+
+def _write_positions_json(position_data):
     with open("positions.json", "w") as f:
         json.dump(position_data, f, indent=2)
 
-    df = pd.DataFrame(position_data)
-    df.to_csv("positions.csv", index=False)
 
+def _report_export_error(future):
+    if future.exception() is not None:
+        log_error_once(f"Position JSON export failed: {future.exception()}")
 
-def main():
 
-    if ENABLE_TIME_WAIT == 'Y':
-        PREMARKET_OPEN = dtime(7, 0)
-        while datetime.now(EASTERN).time() < PREMARKET_OPEN:
-            print("Market off limit right now: holding...")
-            time.sleep(30)
+def _wait_until(target_minute, message, days_ahead=0):
+    # Sleep straight through to target_minute (a MktMinute, Eastern) on today + days_ahead;
+    # no-op if already past. Loops only when the sleep ends early (clock adjustment),
+    # re-measuring the remaining time.
+    target_date = datetime.now(EASTERN).date() + timedelta(days=days_ahead)
+    target = EASTERN.localize(datetime.combine(target_date, dtime(*divmod(target_minute, 60))))
+    delay = (target - datetime.now(EASTERN)).total_seconds()
+    if delay > 0:
+        print(message)
+    while delay > 0:
+        time.sleep(delay)
+        delay = (target - datetime.now(EASTERN)).total_seconds()
+
 
-        while datetime.now(EASTERN).time() < MARKET_OPEN:
-            print("Pre-market: holding...")
-            time.sleep(30)
+def main():
+
+    if _TIME_WAIT:
+        _wait_until(MktMinute.PREMARKET_OPEN, "Market off limit right now: holding...")
+        _wait_until(MktMinute.MARKET_OPEN, "Pre-market: holding...")
 
-        while not is_market_open():
-            print("Waiting for market to open...")
-            time.sleep(60)
+        # Started after the close: hold for the next day's open
+        if now_est_minutes() >= MktMinute.MARKET_CLOSE:
+            _wait_until(MktMinute.MARKET_OPEN, "Waiting for market to open...", days_ahead=1)
 
     if not is_market_open():
         print("Market is closed. Exiting.")
@@ -288,7 +346,7 @@ def main():
     print("Account summary:")
     print(account)
 
-    # Export positions to JSON and CSV
+    # Export positions to JSON and Parquet (CSV when enabled or without pyarrow)
     export_positions(ib)
 
     ib.disconnect()
@@ -315,26 +373,47 @@ audit_specs = {
     # Add additional models as needed
 }
 
+# Positions as one array per field (symbol, secType, position), so audit checks are array compares
+def positions_to_soa(positions):
+    return {
+        "symbol": np.array([contract.symbol for _, contract, _ in positions], dtype=object),
+        "secType": np.array([contract.secType for _, contract, _ in positions], dtype=object),
+        "position": np.array([position for _, _, position in positions]),
+    }
+
+
 # Example audit execution
 
 def run_model_audit(model_name, positions):
+    # positions: ib.positions() tuples, or a dict from positions_to_soa
     spec = audit_specs.get(model_name)
     if not spec:
         print(f"[AUDIT] No audit spec found for model: {model_name}")
         return
 
     print(f"[AUDIT] Running audit for model: {model_name}")
+    p = positions if isinstance(positions, dict) else positions_to_soa(positions)
+    size = p["position"]
+    none_held = np.zeros(len(size), dtype=bool)
+    too_large = np.zeros(len(size), dtype=bool)
+    bad_instrument = np.zeros(len(size), dtype=bool)
+    if spec.get("requires_position_check"):
+        none_held = size == 0
+    if spec.get("max_order_size"):
+        too_large = np.abs(size) > spec["max_order_size"]
+    if "permitted_instruments" in spec:
+        bad_instrument = ~np.isin(p["secType"], list(spec["permitted_instruments"]))
+
+    # Messages only for flagged rows, in position order as before
     failures = []
-
-    for acct, contract, position in positions:
-        if spec.get("requires_position_check") and position == 0:
-            failures.append(f"No position held in {contract.symbol} for audit-required model.")
-
-        if spec.get("max_order_size") and abs(position) > spec["max_order_size"]:
-            failures.append(f"Position size {position} in {contract.symbol} exceeds allowed max of {spec['max_order_size']}")
-
-        if "permitted_instruments" in spec and contract.secType not in spec["permitted_instruments"]:
-            failures.append(f"Instrument {contract.secType} not permitted in model {model_name}")
+    for i in np.flatnonzero(none_held | too_large | bad_instrument).tolist():
+        symbol = p["symbol"][i]
+        if none_held[i]:
+            failures.append(f"No position held in {symbol} for audit-required model.")
+        if too_large[i]:
+            failures.append(f"Position size {size[i]} in {symbol} exceeds allowed max of {spec['max_order_size']}")
+        if bad_instrument[i]:
+            failures.append(f"Instrument {p['secType'][i]} not permitted in model {model_name}")
 
     if failures:
         print(f"[AUDIT] Issues found for {model_name}:")
@@ -7,58 +7,62 @@
 #    /Establish the mechanics on the apportionment of the trading account, by permissible patterns of segmentations,
 #    /permissible amounts allocated per segmentation, segment margin spending limits, and responses when violated.
 
-from date_time import datetime
-
-from models import (golden_crossover_strategy_model(),
-  iv_rank_options_trades_model(),
-  options_expiry_pinning_model(),
-  post_earnings_drift_model(),
-  rsi_reversion_strategy_model(),
-  skew_drift_signal_model(),
-  spx_vix_divergence_model(),
-  turn_of_month_effect_model(),
-  twelve_one_momentum_model(),
-  volatility_mean_reversion_model(),
-  “…()”,
-  “…()”,
-  “…()”,
-  “…()”,
-  “…()”,
-  “…()”,
-  “…()”,
-  “…()”,
-  “…()”,
-  “…()” ]
+import os
+import runpy
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
 
 # from To_The_Moon.scanners import (cup and handle, pmcc, other...)
 
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bin id -> model script in models/. Bin numbers are permanent (rule 10); 11-20 are not yet assigned.
+# Most model scripts are saved without a .py extension; the names below are the files as they are.
+BIN_MODELS = {
+    1: "golden_crossover_strategy_model.py",
+    2: "iv_rank_options_trades_model",
+    3: "options_expiry_pinning_model",
+    4: "post_earnings_drift_model",
+    5: "rsi_reversion_strategy_model",
+    6: "skew_drift_signal_model",
+    7: "spx_vix_divergence_model",
+    8: "turn_of_month_effect_model",
+    # 9: "twelve_one_momentum_model",  # held out until the script compiles (IndentationError)
+    10: "volatility_mean_reversion_model",
+}
+
+total_number_bins = 20
+
+
+def run_bin_model(bin_id):
+    '''Runs one bin's model script as __main__ and returns its DataFrame/Series results by name'''
+    namespace = runpy.run_path(os.path.join(MODELS_DIR, BIN_MODELS[bin_id]), run_name="__main__")
+    return {name: value for name, value in namespace.items()
+            if isinstance(value, (pd.DataFrame, pd.Series))}
+
+
+def evaluate_all(bin_ids=None, max_workers=None):
+    '''
+    Runs the bin models (all assigned bins by default), one per worker process.
+    A failing bin does not cost the others their results.
+
+    Returns:
+    - (results, errors): {bin_id: results} for bins that ran, {bin_id: exception} for bins that failed
+    '''
+    bin_ids = sorted(BIN_MODELS) if bin_ids is None else list(bin_ids)
+    results, errors = {}, {}
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        futures = {ex.submit(run_bin_model, bin_id): bin_id for bin_id in bin_ids}
+        for future in as_completed(futures):
+            bin_id = futures[future]
+            try:
+                results[bin_id] = future.result()
+            except Exception as e:
+                errors[bin_id] = e
+                print(f"Bin {bin_id} ({BIN_MODELS.get(bin_id)}) failed: {e!r}")
+    return dict(sorted(results.items())), dict(sorted(errors.items()))
 
-bin_apportionment_model_identity = [ “one”,”two”,”three”,”four”,”five”,”six”,”seven”,”eight”,”nine”,”ten”,
-  ”eleven”,”twelve”,”thirteen”,”fourteen”,”fifteen”,”sixteen”,”seventeen”,”eighteen”,”nineteen”,”twenty”]
-
-one = golden_crossover_strategy_model()
-two = iv_rank_options_trades_model()
-three = options_expiry_pinning_model()
-four = post_earnings_drift_model()
-five = rsi_reversion_strategy_model()
-six = skew_drift_signal_model()
-seven = spx_vix_divergence_model()
-eight = turn_of_month_effect_model()
-nine = twelve_one_momentum_model()
-ten = volatility_mean_reversion_model()
-eleven = “…()”
-twelve = “…()”
-thirteen = “…()”
-fourteen = “…()”
-fifteen = “…()”
-sixteen = “…()”
-seventeen = “…()”
-eighteen = “…()”
-nineteen = “…()”
-twenty = “…()”
-
-
-total_number_bins = len(bin_apportionment_model_identity)
 
 '''
 
@@ -105,8 +109,8 @@ total_number_bins = len(bin_apportionment_model_identity)
 # of bin assignments.
 
 # rule 11 - The standard warning notification classification schemes, warning color expressions, and any interrelated logic, is to
-remain persistent for a period of time proportionate to the rules for those color assignments.  When yellow, orange, red, shutout
-tiered responses are to occur, with the requisite consequences if manipulated, overridden, or violated.
+# remain persistent for a period of time proportionate to the rules for those color assignments.  When yellow, orange, red, shutout
+# tiered responses are to occur, with the requisite consequences if manipulated, overridden, or violated.
 
 def evaluate_bin_safety(bin assignments, bin percentages, bin ...)
 
@@ -143,5 +147,4 @@ def bin_apportionment_amount (...)
   # When should a new bin be permitted in? When opportunity is fiduciarily irresponsible not to take hold?
   # This needs significant work...
 
-  
-    
+'''
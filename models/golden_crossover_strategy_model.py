@@ -9,16 +9,20 @@
 #   - Introduce dynamic position sizing based on macro (Golden Cross) vs. tactical entry filters
 #   - Ensure signal compliance and system auditability
 
+import os
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
 # Custom module for exclusion logic
 from utils.exclusion_tools import should_trade_on
-# Import externalized whipsaw filter
-from helpers.volatility_filters import vix_whipsaw_filter
-# Import tactical entry filter
-from helpers.entry_conditions_helper import entry_conditions_met
+# Import externalized whipsaw filter (whole-series form)
+from helpers.vix_whipsaw_filter import vix_whipsaw_sweep, Regime
+# Import tactical entry filter (whole-frame form)
+from helpers.entry_conditions_met import entry_conditions_met_batch
+# SMA/EMA indicator columns in one pass
+from helpers.moving_averages import fused_indicators
 
 '''
 INSTRUCTIONS:
@@ -44,8 +48,23 @@ To make vix_whipsaw_filter work as a reusable helper, ensure the following insid
 ticker = 'SPY'
 vix_ticker = '^VIX'
 
-spy_data = yf.download(ticker, start='2000-01-01', end='2025-05-01')
-vix_data = yf.download(vix_ticker, start='2000-01-01', end='2025-05-01')
+YF_CACHE_DIR = os.path.join('.cache', 'yf')
+
+def download_cached(symbol, start, end):
+    # yf.download, kept on disk per (symbol, start, end) so reruns skip the network.
+    # Only ranges that have fully closed are stored; a range reaching today is refetched.
+    path = os.path.join(YF_CACHE_DIR, f"{symbol.replace('^', '_')}_{start}_{end}.pkl")
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+    frame = yf.download(symbol, start=start, end=end)
+    if not frame.empty and pd.Timestamp(end) <= pd.Timestamp.today().normalize():
+        os.makedirs(YF_CACHE_DIR, exist_ok=True)
+        frame.to_pickle(path + '.tmp')
+        os.replace(path + '.tmp', path)  # a half-written file is never picked up
+    return frame
+
+spy_data = download_cached(ticker, start='2000-01-01', end='2025-05-01')
+vix_data = download_cached(vix_ticker, start='2000-01-01', end='2025-05-01')
 
 spy_data = spy_data['Close'].copy()
 vix_data = vix_data['Close'].copy()
@@ -53,55 +72,49 @@ vix_data = vix_data['Close'].copy()
 # === Compute Moving Averages ===
 data = pd.DataFrame(index=spy_data.index)
 data['Close'] = spy_data
-data['SMA_50'] = spy_data.rolling(50).mean()
-data['SMA_200'] = spy_data.rolling(200).mean()
-data['EMA_9'] = spy_data.ewm(span=9).mean()
-data['EMA_20'] = spy_data.ewm(span=20).mean()
-data['VWAP'] = spy_data.rolling(5).mean()  # Placeholder for real VWAP logic
+(sma_50, sma_200, mean_5), (ema_9, ema_20) = fused_indicators(
+    spy_data, sma_windows=(50, 200, 5), ema_spans=(9, 20))
+data['SMA_50'] = sma_50
+data['SMA_200'] = sma_200
+data['EMA_9'] = ema_9
+data['EMA_20'] = ema_20
+data['VWAP'] = mean_5  # Placeholder for real VWAP logic
 data['Volume'] = 1000000  # Placeholder: inject real volume if available
 data.dropna(inplace=True)
 
 # === Initialize State and Generate Signals ===
-data['Position'] = 0
+# Each filter runs once over whole columns; only the position state is carried day to day
+sma_50 = data['SMA_50'].to_numpy()
+sma_200 = data['SMA_200'].to_numpy()
+
+tradable = np.array([should_trade_on(d) for d in data.index], dtype=bool)
+
+# Evaluate volatility regime (the filter only sees tradable days, so its state does too)
+regime = vix_whipsaw_sweep(vix_data, dates=data.index[tradable])
+normal = np.zeros(len(data), dtype=bool)
+normal[tradable] = regime == Regime.NORMAL  # Skip trading during yellow/red light regimes
+
+# Tactical filter (entry gating based on VWAP, EMA(9/20), etc.)
+# One sentiment label per row, aligned to data up front. Placeholder: integrate actual sentiment
+# source as e.g. sentiment_series.reindex(data.index).fillna('neutral').to_numpy()
+sentiment = np.full(len(data), 'neutral', dtype=object)
+entry_ok = entry_conditions_met_batch(data, sentiment_score=sentiment)
+
+active = tradable & normal & entry_ok
+
+# Entry size: full/ramped on a Golden Cross (macro trend confirmation), else a smaller tactical position
+entry_size = np.where(sma_50 > sma_200, 1.0, 0.5)
+death_cross = sma_50 < sma_200
+
+positions = np.zeros(len(data), dtype=np.float32)  # 0, 0.5 and 1 are exact; days skipped by a filter stay 0
 position = 0
-state = {}  # VIX regime state holder
-
-for current_date in data.index:
-    if not should_trade_on(current_date):
-        continue
-
-    # Evaluate volatility regime
-    regime, state = vix_whipsaw_filter(current_date, vix_data, state)
-    if regime != 'normal':
-        continue  # Skip trading during yellow/red light regimes
-
-    short_ma = data.loc[current_date, 'SMA_50']
-    long_ma = data.loc[current_date, 'SMA_200']
-    golden_cross_active = short_ma > long_ma
-
-    # Tactical filter (entry gating based on VWAP, EMA(9/20), etc.)
-    sentiment_today = 'neutral'  # Placeholder: integrate actual sentiment source
-    if not entry_conditions_met(current_date, data, sentiment_score=sentiment_today):
-        continue  # Skip if tactical entry gates not satisfied
-
-    # Entry signal: Golden Cross (macro trend confirmation)
-    if short_ma > long_ma and position == 0:
-        position = 1  # Full/ramped position
-        data.at[current_date, 'Position'] = position
-
-    # Tactical entry without Golden Cross (macro trend not confirmed)
-    elif short_ma <= long_ma and position == 0:
-        position = 0.5  # Smaller tactical position
-        data.at[current_date, 'Position'] = position
-
-    # Exit signal: Death Cross
-    elif short_ma < long_ma and position > 0:
-        position = 0
-        data.at[current_date, 'Position'] = position
-
-    # Hold current position if no new signal
-    else:
-        data.at[current_date, 'Position'] = position
+for i in np.flatnonzero(active).tolist():
+    if position == 0:
+        position = entry_size[i]
+    elif death_cross[i]:
+        position = 0  # Exit signal: Death Cross
+    positions[i] = position  # otherwise hold current position
+data['Position'] = positions
 
 # === Final Output Preview ===
 print(data.tail())
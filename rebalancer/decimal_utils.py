@@ -8,11 +8,22 @@
 
 from decimal import Decimal
 
+_HUNDRED = Decimal(100)
+
 
 def to_decimal(number):
     return Decimal(str(number))
 
 
+# Whole cents in number, truncated toward zero, as a plain int.
+# Decimals are used as-is (str() of a Decimal parses back to the same value); anything else
+# goes through str() so that e.g. 0.29 is 29 cents, not int(0.29 * 100) == 28.
+def to_cents(number):
+    if type(number) is not Decimal:
+        number = Decimal(str(number))
+    return int(number * _HUNDRED)
+
+
 # Truncates a number to two decimal places in addition to casting it to a Decimal.
 def to_truncated_decimal(number):
-    return int(Decimal(str(number)) * 100) / Decimal(100)
+    return to_cents(number) / _HUNDRED
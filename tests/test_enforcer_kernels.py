@@ -0,0 +1,32 @@
+# Program: test_enforcer_kernels.py
+# Author: Brian Anderson
+# Origin Date: 11May2025
+# Version: 1.0
+#
+# Purpose:
+#    /Checks that the compiled rule 1-3 + 5 pass (enforcer/_kernels.py) agrees with the
+#    /numpy path of the allocation rule driver.
+
+import numpy as np
+import pytest
+
+from enforcer import enforce_allocation_rules_fullSet as rules
+from enforcer._kernels import enforce_core
+
+
+@pytest.mark.skipif(enforce_core is None, reason="numba not installed")
+@pytest.mark.parametrize("total", [0.5, 1.4])  # under and over the reserve cap
+def test_enforce_core_matches_numpy_path(total):
+    rng = np.random.default_rng(5)
+    weights = rng.random(20)
+    weights *= total / weights.sum()
+    types = rng.integers(-1, 3, 20).astype(np.int8)  # BinType codes
+    max_total, max_bin = 0.8, 0.06
+
+    compiled = weights.copy()
+    futures_total = enforce_core(compiled, types, max_total, max_bin, int(rules.BinType.FUTURES))
+
+    expected = rules._scale_to_cap(weights.copy(), max_total)
+    rules._cap_per_bin(tuple(range(20)), expected, max_bin)
+    np.testing.assert_allclose(compiled, expected, rtol=1e-12)
+    assert futures_total == pytest.approx(expected[types == rules.BinType.FUTURES].sum(), rel=1e-12)
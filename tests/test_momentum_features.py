@@ -0,0 +1,30 @@
+# Program: test_momentum_features.py
+# Author: Brian Anderson
+# Origin Date: 01May2025
+# Version: 1.0
+#
+# Purpose:
+#    /Checks that the compiled MACD feature kernel agrees with its pandas fallback,
+#    /including a flat stretch where the price deviation is exactly zero.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import momentum_features
+
+
+@pytest.mark.skipif(momentum_features._macd_bank_impl is None, reason="numba not installed")
+def test_macd_kernel_matches_pandas(monkeypatch):
+    rng = np.random.default_rng(7)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 700)))
+    values[300:380] = values[300]  # longer than the 63-day price window
+    prices = pd.Series(values, index=pd.bdate_range("2020-01-01", periods=len(values)))
+
+    compiled = momentum_features.macd_features(prices)
+    monkeypatch.setattr(momentum_features, "_macd_bank_impl", None)
+    fallback = momentum_features.macd_features(prices)
+
+    assert list(compiled.columns) == list(fallback.columns)
+    assert np.isfinite(compiled.to_numpy()).any()
+    np.testing.assert_allclose(compiled.to_numpy(), fallback.to_numpy(), rtol=1e-9, atol=1e-9)
@@ -0,0 +1,43 @@
+# Program: test_volatility_momentum_adjustments.py
+# Author: Brian Anderson
+# Origin Date: 01May2025
+# Version: 1.0
+#
+# Purpose:
+#    /Checks that the compiled per-ticker momentum kernels agree with the numpy/pandas fallback.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import volatility_momentum_adjustments as vma
+
+pytestmark = pytest.mark.skipif(vma._normalized_momentum_impl is None, reason="numba not installed")
+
+
+def _prices():
+    rng = np.random.default_rng(11)
+    values = 50 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, (800, 5)), axis=0))
+    values[500:, 4] = 0.0  # zero-filled after delisting: momentum divides by zero
+    return pd.DataFrame(values, index=pd.bdate_range("2019-01-01", periods=800),
+                        columns=["AAA", "BBB", "CCC", "DDD", "DLST"])
+
+
+def test_self_normalized_momentum_matches_fallback(monkeypatch):
+    data = _prices()
+    compiled = vma.self_normalized_momentum(data, periods=vma.SHORT_PERIODS)
+    monkeypatch.setattr(vma, "_normalized_momentum_impl", None)
+    fallback = vma.self_normalized_momentum(data, periods=vma.SHORT_PERIODS)
+
+    assert np.isfinite(compiled.to_numpy()).any()
+    np.testing.assert_allclose(compiled.to_numpy(), fallback.to_numpy(), rtol=1e-7, atol=1e-9)
+
+
+def test_weighted_momentum_matches_fallback(monkeypatch):
+    data = _prices()
+    compiled = vma.internal_volatility_adjusted_momentum(data)
+    monkeypatch.setattr(vma, "_weighted_momentum_impl", None)
+    fallback = vma.internal_volatility_adjusted_momentum(data)
+
+    assert np.isfinite(compiled.to_numpy()).any()
+    np.testing.assert_allclose(compiled.to_numpy(), fallback.to_numpy(), rtol=1e-12)